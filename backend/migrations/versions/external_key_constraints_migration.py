@@ -0,0 +1,33 @@
+"""Add unique external keys to restaurant and supplier
+
+Revision ID: external_key_constraints_migration
+Revises: 00d043abe256
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'external_key_constraints_migration'
+down_revision = '00d043abe256'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Synced rows are upserted on their external key, which needs a unique constraint
+    op.create_unique_constraint(
+        'uix_restaurant_external_key', 'restaurant',
+        ['external_id', 'external_system_type', 'account_id'], schema='getinn_ops'
+    )
+    op.create_unique_constraint(
+        'uix_supplier_external_key', 'supplier',
+        ['external_id', 'external_system_type', 'account_id'], schema='getinn_ops'
+    )
+
+
+def downgrade():
+    op.drop_constraint('uix_supplier_external_key', 'supplier', type_='unique', schema='getinn_ops')
+    op.drop_constraint('uix_restaurant_external_key', 'restaurant', type_='unique', schema='getinn_ops')
@@ -57,7 +57,10 @@ class AccountIntegrationCredentials(Base):
 
 class Restaurant(Base):
     __tablename__ = "restaurant"
-    __table_args__ = {'schema': 'getinn_ops'}
+    __table_args__ = (
+        UniqueConstraint('external_id', 'external_system_type', 'account_id', name='uix_restaurant_external_key'),
+        {'schema': 'getinn_ops'}
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     account_id = Column(UUID(as_uuid=True), ForeignKey("getinn_ops.account.id"), nullable=False)
@@ -6,6 +6,9 @@ from src.api.models.base import *
 
 class Supplier(Base):
     __tablename__ = "supplier"
+    __table_args__ = (
+        UniqueConstraint('external_id', 'external_system_type', 'account_id', name='uix_supplier_external_key'),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     account_id = Column(UUID(as_uuid=True), ForeignKey("account.id"), nullable=False)
@@ -16,6 +16,7 @@ from telegram import Bot
 from telegram.ext import Application
 from telegram.constants import ParseMode
 from telegram.error import TelegramError
+from telegram.request import BaseRequest
 
 from pyngrok import ngrok, conf
 
@@ -30,9 +31,18 @@ logger = logging.getLogger(__name__)
 class WebhookService:
     """Service for managing Telegram bot webhooks."""
     
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, request: Optional[BaseRequest] = None):
         self.db = db
         self.settings = get_settings()
+        # Optional Telegram HTTP request shared across bots so connections are reused
+        self.request = request
+        
+    def _build_application(self, bot_token: str) -> Application:
+        """Build a Telegram application for a bot, on the shared request if there is one."""
+        builder = Application.builder().token(bot_token)
+        if self.request is not None:
+            builder = builder.request(self.request)
+        return builder.build()
         
     def _is_local_environment(self) -> bool:
         """Detect if running in a local development environment."""
@@ -117,7 +127,7 @@ class WebhookService:
             try:
                 # Updated for python-telegram-bot v20+
                 # Create an application builder
-                application = Application.builder().token(bot_token).build()
+                application = self._build_application(bot_token)
                 
                 # Set webhook using the application's bot
                 # IMPORTANT NOTE FOR TELEGRAM WEBHOOK SETUP:
@@ -268,7 +278,7 @@ class WebhookService:
             
             try:
                 # Updated for python-telegram-bot v20+
-                application = Application.builder().token(bot_token).build()
+                application = self._build_application(bot_token)
                 
                 # Get webhook info
                 webhook_info = await application.bot.get_webhook_info()
@@ -325,7 +335,7 @@ class WebhookService:
             
             try:
                 # Updated for python-telegram-bot v20+
-                application = Application.builder().token(bot_token).build()
+                application = self._build_application(bot_token)
                 
                 # Delete webhook
                 await application.bot.delete_webhook()
@@ -12,7 +12,7 @@ from sqlalchemy.orm import Session
 
 from src.api.models.base import IntegrationType, SyncStatus
 from src.api.services.integrations.credentials_service import CredentialsService
-from src.integrations.pos_erp_adapters.iiko.iiko_auth import IikoAuth
+from src.integrations.pos_erp_adapters.iiko.iiko_auth import IikoAuth, get_auth_manager, invalidate_auth_managers
 from src.integrations.pos_erp_adapters.iiko.iiko_client import IikoClient
 from src.integrations.pos_erp_adapters.iiko.iiko_sync import IikoSyncManager
 from src.integrations.pos_erp_adapters.iiko.iiko_types import IikoConnectionStatus, IikoCredentials
@@ -73,6 +73,9 @@ class IikoIntegrationService:
                     base_url=base_url
                 )
                 
+                # Later syncs must log in with the new credentials
+                invalidate_auth_managers(account_id)
+                
                 # Return connection status
                 return IikoConnectionStatus(
                     account_id=account_id,
@@ -195,6 +198,8 @@ class IikoIntegrationService:
                 "message": f"Failed to sync restaurants: {str(e)}",
                 "details": None
             }
+        finally:
+            await sync_manager.client.aclose()
     
     async def sync_stores(self, account_id: str) -> Dict[str, Any]:
         """
@@ -230,6 +235,8 @@ class IikoIntegrationService:
                 "message": f"Failed to sync stores: {str(e)}",
                 "details": None
             }
+        finally:
+            await sync_manager.client.aclose()
     
     async def sync_suppliers(self, account_id: str) -> Dict[str, Any]:
         """
@@ -265,6 +272,8 @@ class IikoIntegrationService:
                 "message": f"Failed to sync suppliers: {str(e)}",
                 "details": None
             }
+        finally:
+            await sync_manager.client.aclose()
     
     async def sync_invoices(
         self,
@@ -315,6 +324,8 @@ class IikoIntegrationService:
                 "message": f"Failed to sync invoices: {str(e)}",
                 "details": None
             }
+        finally:
+            await sync_manager.client.aclose()
     
     def _create_sync_manager(self, account_id: str) -> Optional[IikoSyncManager]:
         """
@@ -326,7 +337,7 @@ class IikoIntegrationService:
         Returns:
             Optional[IikoSyncManager]: Sync manager or None if creation fails
         """
-        try:
+        def load_auth() -> IikoAuth:
             # Get credentials
             credential_entity, credentials = self.credentials_service.get_credentials(
                 account_id=account_id,
@@ -334,15 +345,18 @@ class IikoIntegrationService:
             )
             
             if not credential_entity or not credentials:
-                logger.error(f"No valid credentials found for account {account_id}")
-                return None
+                raise Exception(f"No valid credentials found for account {account_id}")
             
             # Create auth manager
-            auth = IikoAuth(
+            return IikoAuth(
                 base_url=credential_entity.base_url,
                 username=credentials.get("username"),
                 password=credentials.get("password")
             )
+        
+        try:
+            # Reuse the account's auth manager (and its token) from earlier syncs
+            auth = get_auth_manager(account_id, None, load_auth)
             
             # Create client
             client = IikoClient(auth_manager=auth)
@@ -351,8 +365,7 @@ class IikoIntegrationService:
             return IikoSyncManager(
                 db=self.db,
                 account_id=account_id,
-                iiko_client=client,
-                credential_id=str(credential_entity.id)
+                iiko_client=client
             )
             
         except Exception as e:
@@ -0,0 +1,34 @@
+"""
+Unit tests for the iiko data adapters.
+"""
+import pytest
+
+from src.integrations.pos_erp_adapters.iiko.iiko_adapters import adapt_iiko_invoice_to_internal
+
+
+def make_invoice(items):
+    """Build a raw iiko invoice with the given item lines."""
+    return {
+        "id": "inv-1", "number": "A-1", "supplierId": "sup-1", "departmentId": "dep-1",
+        "date": "2024-05-01T10:00:00", "sum": "3", "items": items
+    }
+
+
+def test_invoice_item_fields_are_coerced():
+    """Numeric product IDs and names arrive on the item as strings."""
+    invoice, _, item_attrs = adapt_iiko_invoice_to_internal(
+        make_invoice([{"productId": 42, "name": 7, "amount": "2", "price": "1.5", "sum": "3"}]),
+        "supplier-id",
+        "store-id"
+    )
+
+    item = invoice.items[0]
+    assert (item.product_id, item.product_name, item.unit_name) == ("42", "7", "pcs")
+    assert (item.quantity, item.unit_price, item.total_price) == (2.0, 1.5, 3.0)
+    assert item_attrs[0]["description"] == "7"
+
+
+def test_invoice_item_without_product_id_is_rejected():
+    """A line without a product ID fails the invoice instead of becoming an item with no product."""
+    with pytest.raises(ValueError, match="without a product ID"):
+        adapt_iiko_invoice_to_internal(make_invoice([{"name": "Milk", "amount": "1"}]), "supplier-id", "store-id")
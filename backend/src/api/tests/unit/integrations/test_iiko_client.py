@@ -0,0 +1,183 @@
+"""
+Unit tests for the iiko API client response parsing.
+"""
+import asyncio
+import pytest
+import httpx
+from unittest.mock import AsyncMock
+
+from src.integrations.pos_erp_adapters.iiko.iiko_client import IikoClient, parse_response
+
+
+DEPARTMENTS_XML = b"""<?xml version="1.0" encoding="UTF-8"?>
+<corporateItemDtoes>
+    <corporateItemDto>
+        <id>dep-1</id>
+        <parentId>corp-1</parentId>
+        <code>1</code>
+        <n>Main Restaurant</n>
+        <taxpayerIdNumber>7701234567</taxpayerIdNumber>
+    </corporateItemDto>
+    <corporateItemDto>
+        <code>2</code>
+        <n>Missing id</n>
+    </corporateItemDto>
+</corporateItemDtoes>
+"""
+
+SUPPLIERS_XML = b"""<?xml version="1.0" encoding="UTF-8"?>
+<suppliers>
+    <supplier>
+        <id>sup-1</id>
+        <name>Fresh Farm</name>
+        <code>FF</code>
+        <email></email>
+        <inn>5001234567</inn>
+    </supplier>
+</suppliers>
+"""
+
+
+def make_response(content: bytes, content_type: str = "application/xml") -> httpx.Response:
+    """Build an httpx response with the given body."""
+    return httpx.Response(
+        200,
+        content=content,
+        headers={"content-type": content_type},
+        request=httpx.Request("GET", "https://iiko.test/resto/api"),
+    )
+
+
+@pytest.fixture
+def client():
+    """Fixture for a client with a mocked auth manager."""
+    auth = AsyncMock()
+    auth.get_token = AsyncMock(return_value=("token", None))
+    return IikoClient(auth_manager=auth, base_url="https://iiko.test")
+
+
+@pytest.mark.asyncio
+async def test_get_restaurants_maps_fields(client, monkeypatch):
+    """Restaurants are extracted from the departments XML with mapped keys"""
+    monkeypatch.setattr(
+        client._client, "request", AsyncMock(return_value=make_response(DEPARTMENTS_XML))
+    )
+    
+    restaurants = await client.get_restaurants()
+    
+    assert restaurants == [{
+        "id": "dep-1",
+        "parentId": "corp-1",
+        "code": "1",
+        "name": "Main Restaurant",
+        "taxId": "7701234567",
+    }]
+
+
+@pytest.mark.asyncio
+async def test_get_suppliers_skips_empty_fields(client, monkeypatch):
+    """Empty XML elements are left out of the supplier dict"""
+    monkeypatch.setattr(
+        client._client, "request", AsyncMock(return_value=make_response(SUPPLIERS_XML))
+    )
+    
+    suppliers = await client.get_suppliers()
+    
+    assert suppliers == [{
+        "id": "sup-1",
+        "name": "Fresh Farm",
+        "code": "FF",
+        "taxId": "5001234567",
+    }]
+
+
+@pytest.mark.asyncio
+async def test_get_stores_empty_body(client, monkeypatch):
+    """An empty response body yields no stores"""
+    monkeypatch.setattr(
+        client._client, "request", AsyncMock(return_value=make_response(b""))
+    )
+    
+    assert await client.get_stores() == []
+
+
+def use_transport(client, handler):
+    """Route the client's HTTP traffic through a mock transport."""
+    client._client = httpx.AsyncClient(
+        base_url=client.base_url, transport=httpx.MockTransport(handler)
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("body", [
+    b'[{"number": "A-1"}, {"number": "A-2"}]',
+    b'  {"items": [{"number": "A-1"}, {"number": "A-2"}]}',
+])
+async def test_get_invoices_streams_items(client, body):
+    """Invoices are decoded from both bare-list and wrapped responses"""
+    use_transport(client, lambda request: httpx.Response(200, content=body))
+    
+    invoices = await client.get_invoices("org-1", "2024-01-01T00:00:00", "2024-01-31T00:00:00")
+    
+    assert invoices == [{"number": "A-1"}, {"number": "A-2"}]
+
+
+@pytest.mark.asyncio
+async def test_iter_invoices_refreshes_token_on_401(client):
+    """A 401 clears the token and the request is retried once"""
+    statuses = iter([401, 200])
+    use_transport(client, lambda request: httpx.Response(next(statuses), content=b'[{"number": "A-1"}]'))
+    
+    invoices = [invoice async for invoice in client.iter_invoices("org-1", "from", "to")]
+    
+    assert invoices == [{"number": "A-1"}]
+    client.auth.clear_token.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_iter_invoice_pages_batches_invoices(client):
+    """Invoices are grouped into pages of at most page_size"""
+    body = b'[{"number": "A-1"}, {"number": "A-2"}, {"number": "A-3"}]'
+    use_transport(client, lambda request: httpx.Response(200, content=body))
+    
+    pages = [page async for page in client.iter_invoice_pages("org-1", "from", "to", page_size=2)]
+    
+    assert pages == [[{"number": "A-1"}, {"number": "A-2"}], [{"number": "A-3"}]]
+
+
+@pytest.mark.parametrize("content, expected", [
+    (b'  {"id": "1"}', {"id": "1"}),
+    (b"\n<supplier><id>1</id></supplier>", {"id": "1"}),
+    (b"plain text", {"text_content": "plain text"}),
+])
+def test_parse_response_auto_probes_body(content, expected):
+    """Auto-detection picks the parser from the first significant byte"""
+    response = make_response(content, content_type="text/plain")
+    
+    assert parse_response(response, "auto") == expected
+
+
+@pytest.mark.asyncio
+async def test_concurrent_401s_refresh_token_once(client):
+    """Concurrent callers failing on the same token share one refresh"""
+    seen_tokens = []
+    
+    async def get_token():
+        return ("fresh" if client.auth.clear_token.await_count else "stale"), None
+    
+    async def handler(request):
+        token = request.url.params["key"]
+        seen_tokens.append(token)
+        await asyncio.sleep(0.01)
+        status = 200 if token == "fresh" else 401
+        return httpx.Response(status, content=b"<suppliers/>")
+    
+    client.auth.get_token = AsyncMock(side_effect=get_token)
+    use_transport(client, handler)
+    
+    results = await asyncio.gather(*(client.get_suppliers() for _ in range(5)))
+    
+    assert results == [[]] * 5
+    client.auth.clear_token.assert_awaited_once()
+    assert seen_tokens.count("stale") == 5
+    assert seen_tokens.count("fresh") == 5
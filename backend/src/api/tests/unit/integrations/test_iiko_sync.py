@@ -0,0 +1,170 @@
+"""
+Unit tests for the iiko synchronization manager.
+"""
+import asyncio
+import uuid
+from datetime import date
+from decimal import Decimal
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.api.models import Store
+from src.api.models.base import SyncStatus
+from src.integrations.pos_erp_adapters.iiko.iiko_auth import IikoAuth, get_auth_manager, invalidate_auth_managers
+from src.integrations.pos_erp_adapters.iiko.iiko_sync import IikoSyncManager
+
+
+@pytest.fixture
+def manager():
+    """Fixture for a sync manager with a mocked client and session."""
+    client = MagicMock()
+    client.get_restaurants = AsyncMock(return_value=[{"id": "dep-1"}])
+    client.get_stores = AsyncMock(return_value=[{"id": "store-1"}])
+    client.get_suppliers = AsyncMock(side_effect=Exception("iiko is down"))
+    client.get_invoices = AsyncMock(return_value=[])
+    return IikoSyncManager(db=MagicMock(), account_id=str(uuid.uuid4()), iiko_client=client)
+
+
+@pytest.mark.asyncio
+async def test_sync_all_writes_fetched_entities(manager):
+    """Fetch failures are reported per entity without stopping the other writes."""
+    restaurant = MagicMock(id=uuid.uuid4(), external_id="dep-1")
+    manager.db.query.return_value.options.return_value.filter.return_value.all.return_value = [restaurant]
+    manager._apply_restaurants = MagicMock(return_value={"created": 1})
+    manager._apply_stores = MagicMock(return_value={"created": 1})
+    manager._apply_suppliers = MagicMock()
+    manager._apply_invoices = MagicMock(return_value={"created": 0})
+
+    results = await manager.sync_all()
+
+    manager._apply_restaurants.assert_called_once_with([{"id": "dep-1"}])
+    manager._apply_stores.assert_called_once_with([{"id": "store-1"}])
+    manager._apply_suppliers.assert_not_called()
+    assert results["suppliers"]["errors"] == 1
+    assert results["suppliers"]["error_details"] == [{"error": "iiko is down"}]
+    manager._apply_invoices.assert_called_once_with(restaurant, [])
+    assert results["invoices"] == {str(restaurant.id): {"created": 0}}
+
+
+@pytest.mark.asyncio
+async def test_sync_all_caps_invoice_concurrency(manager):
+    """No more than eight invoice requests are in flight at once."""
+    restaurants = [MagicMock(id=uuid.uuid4(), external_id=f"dep-{i}") for i in range(20)]
+    manager.db.query.return_value.options.return_value.filter.return_value.all.return_value = restaurants
+    manager._apply_restaurants = MagicMock()
+    manager._apply_stores = MagicMock()
+    manager._apply_invoices = MagicMock(return_value={})
+    in_flight = peak = 0
+
+    async def get_invoices(**kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return []
+
+    manager.client.get_invoices = get_invoices
+
+    results = await manager.sync_all()
+
+    assert peak == 8
+    assert len(results["invoices"]) == 20
+
+
+@pytest.mark.asyncio
+async def test_sync_invoices_writes_pages_as_they_arrive(manager):
+    """Page results are summed and a download failure is reported after the written pages."""
+    restaurant = MagicMock(id=uuid.uuid4(), external_id="dep-1", external_system_type="iiko")
+    manager.db.query.return_value.options.return_value.filter_by.return_value.first.return_value = restaurant
+
+    async def iter_invoice_pages(**kwargs):
+        yield [{"number": "A-1"}, {"number": "A-2"}]
+        yield [{"number": "A-3"}]
+        raise Exception("connection reset")
+
+    manager.client.iter_invoice_pages = iter_invoice_pages
+    manager._apply_invoices = MagicMock(side_effect=lambda restaurant, page: {
+        "total": len(page), "created": len(page), "updated": 0, "unchanged": 0, "errors": 0,
+        "error_details": []
+    })
+
+    results = await manager.sync_invoices(str(restaurant.id))
+
+    assert manager._apply_invoices.call_count == 2
+    assert results["total"] == 3
+    assert results["created"] == 3
+    assert results["errors"] == 1
+    assert results["error_details"] == [{"error": "connection reset"}]
+
+
+def test_apply_stores_skips_unchanged_rows(manager):
+    """A store that already holds the synced attributes is not rewritten."""
+    restaurant_id = uuid.uuid4()
+    iiko_store = {"id": "store-1", "name": "Main", "departmentId": "dep-1"}
+    stored = {
+        "id": uuid.uuid4(), "external_id": "store-1", "restaurant_id": restaurant_id, "name": "Main",
+        "external_sync_status": SyncStatus.SYNCED, "external_system_type": "iiko", "external_metadata": iiko_store
+    }
+    manager.db.query.return_value.filter.return_value.all.side_effect = [
+        [MagicMock(external_id="store-1", restaurant_id=restaurant_id, _mapping=stored)],
+        [MagicMock(external_id="dep-1", id=restaurant_id)],
+    ]
+    manager._write_batch = MagicMock()
+
+    results = manager._apply_stores([iiko_store])
+
+    assert (results["unchanged"], results["updated"], results["created"]) == (1, 0, 0)
+    manager._write_batch.assert_called_once_with(Store, [], [], results)
+
+
+@pytest.mark.parametrize("iiko_sum, stored_amount, unchanged", [
+    ("12.3", Decimal("12.30"), True),
+    ("0.1", Decimal("0.10"), True),
+    ("12.345", Decimal("12.35"), True),
+    ("12.31", Decimal("12.30"), False),
+])
+def test_apply_invoices_compares_amounts_as_stored(manager, iiko_sum, stored_amount, unchanged):
+    """Float amounts from iiko match the Numeric(10, 2) Decimals they are stored as."""
+    restaurant = MagicMock(id=uuid.uuid4())
+    supplier_id, store_id = uuid.uuid4(), uuid.uuid4()
+    stored = {
+        "id": uuid.uuid4(), "invoice_number": "A-1", "supplier_id": supplier_id, "store_id": store_id,
+        "invoice_date": date(2024, 5, 1), "due_date": None, "total_amount": stored_amount,
+        "currency": "USD", "status": "active"
+    }
+    unit_result, store_result = MagicMock(), MagicMock()
+    unit_result.first.return_value = MagicMock(id=uuid.uuid4())
+    store_result.first.return_value = MagicMock(id=store_id)
+    manager.db.execute.side_effect = [
+        unit_result,
+        [MagicMock(invoice_number="A-1", supplier_id=supplier_id, store_id=store_id, _mapping=stored)],
+        [MagicMock(external_id="sup-1", id=supplier_id)],
+        store_result,
+    ]
+    manager._write_batch = MagicMock()
+
+    results = manager._apply_invoices(restaurant, [{
+        "id": "inv-1", "number": "A-1", "supplierId": "sup-1", "departmentId": "dep-1",
+        "date": "2024-05-01T10:00:00", "sum": iiko_sum
+    }])
+
+    assert results["unchanged"] == int(unchanged)
+    assert results["updated"] == int(not unchanged)
+    to_update = manager._write_batch.call_args.args[2]
+    assert [row["id"] for row in to_update] == ([] if unchanged else [stored["id"]])
+
+
+def test_auth_manager_is_reused_until_invalidated():
+    """Credentials are loaded once per account until they are invalidated."""
+    account_id = str(uuid.uuid4())
+    load = MagicMock(side_effect=lambda: IikoAuth("https://iiko.test", "user", "pass"))
+
+    first = get_auth_manager(account_id, None, load)
+    second = get_auth_manager(account_id, None, load)
+    invalidate_auth_managers(account_id)
+    third = get_auth_manager(account_id, None, load)
+
+    assert first is second
+    assert third is not first
+    assert load.call_count == 2
@@ -8,6 +8,7 @@ from unittest.mock import AsyncMock, patch, MagicMock
 from datetime import datetime
 from uuid import UUID
 from fastapi import HTTPException
+from telegram.request import HTTPXRequest
 
 from src.api.services.bots.webhook_service import WebhookService
 from src.api.schemas.webhooks.telegram_schemas import WebhookConfigSchema, WebhookStatusSchema
@@ -374,4 +375,15 @@ async def test_ngrok_url_generation():
         
         # Call the method
         url = await webhook_service._get_ngrok_url(path)
-        assert url == "https://abc123.ngrok.io/v1/api/webhooks/telegram/123"
\ No newline at end of file
+        assert url == "https://abc123.ngrok.io/v1/api/webhooks/telegram/123"
+
+def test_build_application_uses_shared_request(mock_db):
+    """Test that applications for different bots share the service's request"""
+    request = HTTPXRequest()
+    webhook_service = WebhookService(mock_db, request=request)
+    
+    first = webhook_service._build_application("111111:first-token")
+    second = webhook_service._build_application("222222:second-token")
+    
+    assert first.bot.request is request
+    assert second.bot.request is request
@@ -0,0 +1,42 @@
+"""
+Unit tests for the code usage analyzer.
+"""
+import os
+import pytest
+
+from src.scripts.analyze_code_usage import UsageTracker
+
+
+@pytest.fixture
+def source_tree(tmp_path):
+    """Fixture for a small source tree with a nested package and an excluded directory."""
+    (tmp_path / "pkg" / "sub").mkdir(parents=True)
+    (tmp_path / "pkg" / "m.py").write_text("x = 1\n")
+    (tmp_path / "pkg" / "sub" / "n.py").write_text("y = 2\n")
+    (tmp_path / "pkg" / "vendor").mkdir()
+    (tmp_path / "pkg" / "vendor" / "v.py").write_text("z = 3\n")
+    (tmp_path / "top.py").write_text("")
+    return tmp_path
+
+
+def relative_paths(root, directory=None):
+    """Relative paths the walker yields for a root."""
+    tracker = UsageTracker(root, exclude=["pkg/vendor"])
+    return [rel_path for _, rel_path in tracker._iter_python_files(directory or tracker.root_path)]
+
+
+@pytest.mark.parametrize("root", [".", "./"])
+def test_relative_root_matches_absolute_root(source_tree, monkeypatch, root):
+    """Walking from '.' yields the same relative paths and exclusions as an absolute root."""
+    expected = ["top.py", os.path.join("pkg", "m.py"), os.path.join("pkg", "sub", "n.py")]
+    monkeypatch.chdir(source_tree)
+
+    assert relative_paths(str(source_tree)) == expected
+    assert relative_paths(root) == expected
+
+
+def test_subdirectory_paths_are_relative_to_root(source_tree):
+    """Files under a scanned subdirectory keep their path relative to the root."""
+    paths = relative_paths(str(source_tree), source_tree / "pkg" / "sub")
+
+    assert paths == [os.path.join("pkg", "sub", "n.py")]
@@ -0,0 +1,45 @@
+"""
+Unit tests for the bot log viewer.
+"""
+import pytest
+
+from src.scripts.bots.utils.view_bot_logs import build_line_needles, filter_logs, read_logs_from_file
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    """Fixture for a log file with a JSON line missing level/event_type, a full JSON line and a plain-text line."""
+    path = tmp_path / "bot_conversations_20230714.log"
+    path.write_text(
+        '{"timestamp": "2023-07-14T10:00:00Z", "message": "no level"}\n'
+        '{"timestamp": "2023-07-14T10:01:00Z", "level": "INFO", "event_type": "INCOMING", "message": "hi"}\n'
+        "plain text line\n"
+    )
+    return str(path)
+
+
+def read_and_filter(log_file, level=None, event_type=None):
+    """Read a file through the raw-line prefilter, then apply the exact filters."""
+    needles = build_line_needles(level=level, event_type=event_type)
+    return filter_logs(read_logs_from_file(log_file, needles), level=level, event_type=event_type)
+
+
+def test_default_level_keeps_lines_without_level(log_file):
+    """Entries that default to INFO are not dropped before parsing."""
+    logs = read_and_filter(log_file, level="INFO")
+
+    assert [log.message for log in logs] == ["no level", "hi", "plain text line"]
+
+
+@pytest.mark.parametrize("event_type, message", [("UNKNOWN", "no level"), ("text", "plain text line")])
+def test_default_event_type_keeps_lines_without_event_type(log_file, event_type, message):
+    """Entries that get a default event type are not dropped before parsing."""
+    logs = read_and_filter(log_file, event_type=event_type)
+
+    assert [log.message for log in logs] == [message]
+
+
+def test_explicit_event_type_narrows_raw_lines(log_file):
+    """A non-default event type still prefilters raw lines and matches exactly."""
+    assert build_line_needles(event_type="INCOMING") == (b"incoming",)
+    assert [log.message for log in read_and_filter(log_file, event_type="INCOMING")] == ["hi"]
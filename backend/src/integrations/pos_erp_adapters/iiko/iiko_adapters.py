@@ -15,6 +15,11 @@ from src.api.models.base import SyncStatus
 logger = logging.getLogger(__name__)
 
 
+def _as_iter(value):
+    """Return XML-converted repeated elements as an iterable without copying."""
+    return value if isinstance(value, list) else (value,)
+
+
 def adapt_iiko_restaurant_to_internal(
     iiko_data: Dict[str, Any],
     account_id: str
@@ -213,10 +218,7 @@ def adapt_iiko_invoice_to_internal(
             # XML structure might have item nested under items
             items_dict = iiko_data["items"]
             if "item" in items_dict:
-                if isinstance(items_dict["item"], list):
-                    item_list = items_dict["item"]
-                else:
-                    item_list = [items_dict["item"]]
+                item_list = _as_iter(items_dict["item"])
         
         for item_data in item_list:
             # Handle different field names in XML vs JSON
@@ -228,11 +230,16 @@ def adapt_iiko_invoice_to_internal(
             total_price = item_data.get("sum") or item_data.get("total_price", 0)
             vat = item_data.get("vatPercent") or item_data.get("vat")
             
+            # IikoInvoiceItem doesn't validate, so a line without a product is
+            # rejected here and the invoice is reported like any other bad record
+            if product_id is None or product_id == "":
+                raise ValueError(f"Invoice item without a product ID: {product_name}")
+            
             item = IikoInvoiceItem(
-                product_id=product_id,
-                product_name=product_name,
+                product_id=str(product_id),
+                product_name=str(product_name or "Unnamed Product"),
                 quantity=float(quantity) if quantity else 0,
-                unit_name=unit_name,
+                unit_name=str(unit_name or "pcs"),
                 unit_price=float(unit_price) if unit_price else 0,
                 total_price=float(total_price) if total_price else 0,
                 vat=float(vat) if vat else None
@@ -8,7 +8,7 @@ import time
 import logging
 from datetime import datetime
 import httpx
-from typing import Dict, Optional, Tuple
+from typing import Callable, Dict, Optional, Tuple
 
 from src.api.core.config import get_settings
 
@@ -138,4 +138,48 @@ class IikoAuth:
     async def clear_token(self) -> None:
         """Clear the stored token."""
         self.token = None
-        self.token_expiry = 0
\ No newline at end of file
+        self.token_expiry = 0
+
+
+# Auth managers reused across sync runs so their tokens survive between jobs,
+# keyed by (account_id, credential_id)
+_AUTH_TTL = 3600
+_AUTH_CACHE_SIZE = 128
+_auth_managers: Dict[Tuple[str, Optional[str]], Tuple[IikoAuth, float]] = {}
+
+
+def get_auth_manager(
+    account_id: str,
+    credential_id: Optional[str],
+    load: Callable[[], IikoAuth]
+) -> IikoAuth:
+    """
+    Get a cached authentication manager for an account.
+    
+    Args:
+        account_id: Internal account ID
+        credential_id: Optional specific credential ID
+        load: Builds the manager from stored credentials on a cache miss
+    
+    Returns:
+        IikoAuth: Authentication manager
+    """
+    key = (str(account_id), credential_id)
+    cached = _auth_managers.get(key)
+    if cached and time.time() < cached[1]:
+        return cached[0]
+    
+    auth = load()
+    
+    # Drop the oldest entry once the cache is full
+    _auth_managers.pop(key, None)
+    if len(_auth_managers) >= _AUTH_CACHE_SIZE:
+        del _auth_managers[next(iter(_auth_managers))]
+    _auth_managers[key] = (auth, time.time() + _AUTH_TTL)
+    return auth
+
+
+def invalidate_auth_managers(account_id: str) -> None:
+    """Forget cached authentication managers for an account, e.g. after its credentials change."""
+    for key in [key for key in _auth_managers if key[0] == str(account_id)]:
+        del _auth_managers[key]
@@ -4,10 +4,15 @@ iiko API client module.
 This module provides a client for making requests to the iiko API and handles XML responses.
 """
 
+import sys
+import asyncio
+import functools
 import logging
 import httpx
-import xml.etree.ElementTree as ET
-from typing import Dict, List, Optional, Any, Union
+import ijson
+from io import BytesIO
+from lxml import etree
+from typing import AsyncIterator, Dict, List, Optional, Any, Union
 
 from .iiko_auth import IikoAuth
 from src.api.core.config import get_settings
@@ -15,6 +20,106 @@ from src.api.core.config import get_settings
 settings = get_settings()
 logger = logging.getLogger(__name__)
 
+# Tag names repeat across every item, so share one string object per name
+_INTERN = sys.intern
+
+# API endpoints, relative to the client's base URL
+_EP_DEPARTMENTS = "resto/api/corporation/departments"
+_EP_STORES = "resto/api/corporation/stores"
+_EP_SUPPLIERS = "resto/api/suppliers"
+_EP_SUPPLIERS_SEARCH = "resto/api/suppliers/search"
+_EP_INVOICES = "api/invoices"
+
+# Parse raw response bytes so lxml honours the XML encoding declaration
+_PARSER = etree.XMLParser(
+    recover=False,
+    resolve_entities=False,
+    no_network=True,
+    remove_comments=True,
+    remove_pis=True,
+)
+
+# (container tag, item tag) of the fixed-schema reference responses
+_CORPORATE_ITEMS = ("corporateItemDtoes", "corporateItemDto")
+_SUPPLIER_ITEMS = ("suppliers", "supplier")
+
+# XML tag -> output key for each reference entity
+_RESTAURANT_FIELDS = {
+    "id": "id",
+    "parentId": "parentId",
+    "code": "code",
+    "n": "name",
+    "taxpayerIdNumber": "taxId",
+}
+_STORE_FIELDS = {
+    "id": "id",
+    "code": "code",
+    "n": "name",
+    "departmentId": "departmentId",
+}
+_SUPPLIER_FIELDS = {
+    "id": "id",
+    "name": "name",
+    "code": "code",
+    "phone": "phone",
+    "email": "email",
+    "inn": "taxId",
+}
+
+
+def parse_flat_items(
+    content: bytes,
+    container_tag: str,
+    item_tag: str,
+    field_map: Dict[str, str]
+) -> List[Dict[str, Any]]:
+    """
+    Stream flat items out of an XML document without building the full tree.
+    
+    Each item element is converted as soon as it has been parsed and then
+    cleared, so memory stays bounded by a single item.
+    
+    Args:
+        content: Raw XML response body
+        container_tag: Tag of the element holding the repeated items
+        item_tag: Tag of the repeated item elements
+        field_map: XML tag -> output key for the scalar child fields
+        
+    Returns:
+        List[Dict[str, Any]]: Items that have an "id" field
+    """
+    if not content.strip():
+        return []
+    
+    items = []
+    events = etree.iterparse(
+        BytesIO(content),
+        events=("end",),
+        tag=item_tag,
+        recover=False,
+        resolve_entities=False,
+        no_network=True,
+        remove_comments=True,
+        remove_pis=True,
+    )
+    for _, elem in events:
+        parent = elem.getparent()
+        if parent is not None and parent.tag == container_tag:
+            item = {
+                out: text
+                for child in elem
+                if (out := field_map.get(child.tag)) and (text := (child.text or "").strip())
+            }
+            if "id" in item:
+                items.append(item)
+        
+        # Drop the processed item and any earlier siblings
+        elem.clear()
+        while elem.getprevious() is not None:
+            del parent[0]
+    
+    return items
+
 
 def xml_to_dict(element):
     """Convert XML element to dictionary recursively."""
@@ -22,7 +127,7 @@ def xml_to_dict(element):
     
     # Add element attributes
     for key, value in element.attrib.items():
-        result[f"@{key}"] = value
+        result[_INTERN(f"@{key}")] = value
     
     # Handle text content if it exists
     if element.text and element.text.strip():
@@ -34,12 +139,12 @@ def xml_to_dict(element):
     # Process child elements
     child_counts = {}
     for child in element:
-        tag = child.tag
+        tag = _INTERN(child.tag)
         child_counts[tag] = child_counts.get(tag, 0) + 1
     
     # Add children to result
     for child in element:
-        tag = child.tag
+        tag = _INTERN(child.tag)
         child_data = xml_to_dict(child)
         
         # If there are multiple children with the same tag, create a list
@@ -53,23 +158,42 @@ def xml_to_dict(element):
     return result
 
 
-def parse_response(response, expected_format="auto"):
+def _probe_format(content: bytes) -> str:
+    """Guess the body format ('xml', 'json' or 'text') from its first significant byte."""
+    first = next((b for b in content[:64] if b not in b" \t\r\n"), None)
+    if first == ord("<"):
+        return "xml"
+    if first in (ord("{"), ord("[")):
+        return "json"
+    return "text"
+
+
+def parse_response(response, expected_format="json"):
     """
     Parse API response based on content type.
     
     Args:
         response: httpx Response object
-        expected_format: The expected format ('json', 'xml', or 'auto' to detect)
+        expected_format: The expected format ('json', 'xml', 'bytes' for the raw
+            body, or 'auto' to detect)
         
     Returns:
         Dict or List: Parsed response data
     """
+    # Known schemas are streamed by the caller straight from the body
+    if expected_format == "bytes":
+        return response.content
+    
     content_type = response.headers.get("content-type", "").lower()
     
     # Empty response
-    if not response.text.strip():
+    if not response.content.strip():
         return {}
     
+    # Auto-detect by probing the body rather than attempting each parser
+    if expected_format == "auto" and not content_type.startswith(("application/json", "application/xml")):
+        expected_format = _probe_format(response.content)
+    
     # Force specific format if requested
     if expected_format == "json" or content_type.startswith("application/json"):
         try:
@@ -81,25 +205,102 @@ def parse_response(response, expected_format="auto"):
     
     if expected_format == "xml" or content_type.startswith("application/xml"):
         try:
-            root = ET.fromstring(response.text)
+            root = etree.fromstring(response.content, parser=_PARSER)
             return xml_to_dict(root)
         except Exception as e:
             logger.error(f"Failed to parse XML: {str(e)}")
             logger.debug(f"Response content: {response.text[:500]}")
             raise
     
-    # If auto-detect and not caught by the above
-    try:
-        return response.json()
-    except Exception:
+    # Neither JSON nor XML: return text content as fallback
+    logger.warning(f"Unrecognized response format (content type: {content_type or 'none'})")
+    return {"text_content": response.text}
+
+
+class _AsyncByteReader:
+    """Minimal async file-like adapter feeding an httpx byte stream to ijson."""
+    
+    def __init__(self, head: bytes, chunks: AsyncIterator[bytes]):
+        self._head = head
+        self._chunks = chunks
+    
+    async def read(self, size: int = -1) -> bytes:
+        """Return the next available chunk, or b"" once the stream is exhausted."""
+        # ijson probes the stream type with a zero-length read
+        if size == 0:
+            return b""
+        if self._head:
+            data, self._head = self._head, b""
+            return data
+        async for chunk in self._chunks:
+            if chunk:
+                return chunk
+        return b""
+
+
+async def iter_json_items(response: httpx.Response) -> AsyncIterator[Any]:
+    """
+    Incrementally decode the items of a streamed JSON response.
+    
+    Supports both a bare JSON array and an object with an "items" array.
+    
+    Args:
+        response: Streaming httpx Response object
+        
+    Yields:
+        Any: Decoded items, one at a time
+    """
+    chunks = response.aiter_bytes()
+    head = b""
+    async for chunk in chunks:
+        head += chunk
+        if head.strip():
+            break
+    
+    head = head.lstrip()
+    if not head:
+        return
+    
+    prefix = "item" if head.startswith(b"[") else "items.item"
+    reader = _AsyncByteReader(head, chunks)
+    async for item in ijson.items_async(reader, prefix, use_float=True):
+        yield item
+
+
+def _apply_auth(kwargs: Dict[str, Any], auth_type: str, token: str) -> None:
+    """Add the auth token to request kwargs ('query' key param or 'header' bearer)."""
+    if auth_type == "query":
+        # Some endpoints expect 'key' query parameter
+        kwargs.setdefault("params", {})["key"] = token
+    elif auth_type == "header":
+        # Other endpoints expect Authorization header
+        kwargs.setdefault("headers", {})["Authorization"] = f"Bearer {token}"
+
+
+def retry_on_401(send):
+    """
+    Retry a client request once with a refreshed token when iiko answers 401.
+    
+    The wrapped coroutine receives (method, endpoint, auth_type,
+    expected_format, kwargs) and must raise httpx.HTTPStatusError on failure.
+    """
+    @functools.wraps(send)
+    async def wrapper(self, method, endpoint, auth_type, expected_format, kwargs):
+        refresh_gen = self._refresh_gen
         try:
-            root = ET.fromstring(response.text)
-            return xml_to_dict(root)
-        except Exception as e:
-            logger.error(f"Failed to auto-detect format: {str(e)}")
-            logger.debug(f"Response content: {response.text[:500]}")
-            # Return text content as fallback
-            return {"text_content": response.text}
+            return await send(self, method, endpoint, auth_type, expected_format, kwargs)
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code != 401:
+                raise
+            
+            token = await self._refresh_token(refresh_gen)
+            if not token:
+                raise
+            
+            _apply_auth(kwargs, auth_type, token)
+            return await send(self, method, endpoint, auth_type, expected_format, kwargs)
+    
+    return wrapper
 
 
 class IikoClient:
@@ -132,13 +333,57 @@ class IikoClient:
             self.auth = IikoAuth(base_url, username, password)
         
         self.base_url = base_url or "https://chiho-co.iiko.it"
+        
+        # Shared HTTP/2 client so concurrent requests multiplex over one connection
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            http2=True,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+            timeout=httpx.Timeout(30.0, connect=10.0),
+        )
+        
+        # Single-flight token refresh: concurrent 401s trigger one re-login
+        self._refresh_lock = asyncio.Lock()
+        self._refresh_gen = 0
+    
+    async def aclose(self) -> None:
+        """Close the underlying HTTP connection pool."""
+        await self._client.aclose()
+    
+    async def __aenter__(self) -> "IikoClient":
+        """Use the client as an async context manager."""
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        """Close the connection pool on exit."""
+        await self.aclose()
+    
+    async def _refresh_token(self, seen_gen: int) -> Optional[str]:
+        """
+        Refresh the authentication token once per expiry.
+        
+        Callers that raced on the same expired token wait for the first
+        refresh and then reuse its result instead of logging in again.
+        
+        Args:
+            seen_gen: Refresh generation observed when the failed request was sent
+        
+        Returns:
+            Optional[str]: Fresh token, or None if it could not be obtained
+        """
+        async with self._refresh_lock:
+            if seen_gen == self._refresh_gen:
+                await self.auth.clear_token()
+                self._refresh_gen += 1
+            token, _ = await self.auth.get_token()
+            return token
     
     async def _make_request(
         self,
         method: str,
         endpoint: str,
         auth_type: str = "query",
-        expected_format: str = "auto",
+        expected_format: str = "json",
         **kwargs
     ) -> Dict[str, Any]:
         """
@@ -146,9 +391,9 @@ class IikoClient:
         
         Args:
             method: HTTP method (get, post, etc.)
-            endpoint: API endpoint (relative to base URL)
+            endpoint: API endpoint (relative to the client's base URL)
             auth_type: How to provide auth token ('query' or 'header')
-            expected_format: Expected response format ('json', 'xml', or 'auto')
+            expected_format: Expected response format ('json', 'xml', 'bytes', or 'auto')
             **kwargs: Additional arguments to pass to httpx
         
         Returns:
@@ -161,61 +406,37 @@ class IikoClient:
         if not token:
             raise Exception(f"Failed to get authentication token: {error}")
         
-        url = f"{self.base_url}/{endpoint}"
-        
-        # Add authentication based on auth_type
-        if auth_type == "query":
-            # Some endpoints expect 'key' query parameter
-            if "params" not in kwargs:
-                kwargs["params"] = {}
-            kwargs["params"]["key"] = token
-        elif auth_type == "header":
-            # Other endpoints expect Authorization header
-            if "headers" not in kwargs:
-                kwargs["headers"] = {}
-            kwargs["headers"]["Authorization"] = f"Bearer {token}"
+        _apply_auth(kwargs, auth_type, token)
         
         try:
-            async with httpx.AsyncClient() as client:
-                response = await getattr(client, method.lower())(url, **kwargs)
-                response.raise_for_status()
-                
-                # Parse the response based on content type
-                return parse_response(response, expected_format)
-                    
-        except httpx.HTTPStatusError as e:
-            logger.error(f"HTTP error {e.response.status_code} for URL {url}: {e.response.text}")
-            
-            # If authentication error, try to refresh token and retry once
-            if e.response.status_code == 401:
-                await self.auth.clear_token()
-                token, error = await self.auth.get_token()
-                
-                if token:
-                    # Update the token and retry
-                    if auth_type == "query":
-                        kwargs["params"]["key"] = token
-                    elif auth_type == "header":
-                        kwargs["headers"]["Authorization"] = f"Bearer {token}"
-                    
-                    async with httpx.AsyncClient() as client:
-                        response = await getattr(client, method.lower())(url, **kwargs)
-                        response.raise_for_status()
-                        
-                        # Parse the response based on content type
-                        return parse_response(response, expected_format)
+            return await self._send(method, endpoint, auth_type, expected_format, kwargs)
             
-            # If we got here, the retry failed or wasn't attempted
+        except httpx.HTTPStatusError as e:
+            logger.error(f"HTTP error {e.response.status_code} for endpoint {endpoint}: {e.response.text}")
             raise Exception(f"HTTP error {e.response.status_code}: {e.response.text}")
             
         except httpx.RequestError as e:
-            logger.error(f"Request error for URL {url}: {str(e)}")
+            logger.error(f"Request error for endpoint {endpoint}: {str(e)}")
             raise Exception(f"Network error during API request: {str(e)}")
             
         except Exception as e:
-            logger.error(f"Unexpected error for URL {url}: {str(e)}")
+            logger.error(f"Unexpected error for endpoint {endpoint}: {str(e)}")
             raise Exception(f"Unexpected error during API request: {str(e)}")
     
+    @retry_on_401
+    async def _send(
+        self,
+        method: str,
+        endpoint: str,
+        auth_type: str,
+        expected_format: str,
+        kwargs: Dict[str, Any]
+    ) -> Any:
+        """Send a single request and parse the response."""
+        response = await self._client.request(method, endpoint, **kwargs)
+        response.raise_for_status()
+        return parse_response(response, expected_format)
+    
     # API endpoint methods
     
     async def get_restaurants(self, revision_from: int = -1) -> List[Dict[str, Any]]:
@@ -229,43 +450,14 @@ class IikoClient:
             List[Dict[str, Any]]: List of restaurant data
         """
         params = {"revisionFrom": revision_from}
-        response = await self._make_request(
+        content = await self._make_request(
             "GET", 
-            "resto/api/corporation/departments", 
+            _EP_DEPARTMENTS,
             params=params,
-            expected_format="xml"
+            expected_format="bytes"
         )
         
-        # Extract restaurant items from XML structure
-        restaurants = []
-        if "corporateItemDtoes" in response:
-            corporate_items = response["corporateItemDtoes"].get("corporateItemDto", [])
-            # Ensure we have a list even if only one item was returned
-            if not isinstance(corporate_items, list):
-                corporate_items = [corporate_items]
-                
-            # Process each restaurant
-            for item in corporate_items:
-                restaurant = {}
-                
-                # Map XML fields to dictionary
-                for field in ["id", "parentId", "code"]:
-                    if field in item:
-                        restaurant[field] = item[field]
-                
-                # Handle name field (in XML it's "n")
-                if "n" in item:
-                    restaurant["name"] = item["n"]
-                
-                # Handle taxpayer ID
-                if "taxpayerIdNumber" in item:
-                    restaurant["taxId"] = item["taxpayerIdNumber"]
-                
-                # Add to list if it's a valid restaurant
-                if "id" in restaurant:
-                    restaurants.append(restaurant)
-        
-        return restaurants
+        return parse_flat_items(content, *_CORPORATE_ITEMS, _RESTAURANT_FIELDS)
     
     async def get_stores(self, revision_from: int = -1) -> List[Dict[str, Any]]:
         """
@@ -278,43 +470,14 @@ class IikoClient:
             List[Dict[str, Any]]: List of store data
         """
         params = {"revisionFrom": revision_from}
-        response = await self._make_request(
+        content = await self._make_request(
             "GET", 
-            "resto/api/corporation/stores", 
+            _EP_STORES,
             params=params,
-            expected_format="xml"
+            expected_format="bytes"
         )
         
-        # Extract store items from XML structure
-        stores = []
-        if "corporateItemDtoes" in response:
-            corporate_items = response["corporateItemDtoes"].get("corporateItemDto", [])
-            # Ensure we have a list even if only one item was returned
-            if not isinstance(corporate_items, list):
-                corporate_items = [corporate_items]
-                
-            # Process each store
-            for item in corporate_items:
-                store = {}
-                
-                # Map XML fields to dictionary
-                for field in ["id", "code"]:
-                    if field in item:
-                        store[field] = item[field]
-                
-                # Handle name field (in XML it's "n")
-                if "n" in item:
-                    store["name"] = item["n"]
-                
-                # Handle department ID
-                if "departmentId" in item:
-                    store["departmentId"] = item["departmentId"]
-                
-                # Add to list if it's a valid store
-                if "id" in store:
-                    stores.append(store)
-        
-        return stores
+        return parse_flat_items(content, *_CORPORATE_ITEMS, _STORE_FIELDS)
     
     async def get_suppliers(self) -> List[Dict[str, Any]]:
         """
@@ -323,38 +486,13 @@ class IikoClient:
         Returns:
             List[Dict[str, Any]]: List of supplier data
         """
-        response = await self._make_request(
+        content = await self._make_request(
             "GET", 
-            "resto/api/suppliers",
-            expected_format="xml"
+            _EP_SUPPLIERS,
+            expected_format="bytes"
         )
         
-        # Extract supplier items from XML structure
-        suppliers = []
-        if "suppliers" in response:
-            supplier_items = response["suppliers"].get("supplier", [])
-            # Ensure we have a list even if only one item was returned
-            if not isinstance(supplier_items, list):
-                supplier_items = [supplier_items]
-                
-            # Process each supplier
-            for item in supplier_items:
-                supplier = {}
-                
-                # Map XML fields to dictionary
-                for field in ["id", "name", "code", "phone", "email", "inn"]:
-                    if field in item:
-                        # Map inn to taxId for consistency
-                        if field == "inn":
-                            supplier["taxId"] = item[field]
-                        else:
-                            supplier[field] = item[field]
-                
-                # Add to list if it's a valid supplier
-                if "id" in supplier:
-                    suppliers.append(supplier)
-        
-        return suppliers
+        return parse_flat_items(content, *_SUPPLIER_ITEMS, _SUPPLIER_FIELDS)
     
     async def search_suppliers(self, name: str) -> List[Dict[str, Any]]:
         """
@@ -367,49 +505,27 @@ class IikoClient:
             List[Dict[str, Any]]: List of matching supplier data
         """
         params = {"name": name}
-        response = await self._make_request(
+        content = await self._make_request(
             "GET", 
-            "resto/api/suppliers/search", 
+            _EP_SUPPLIERS_SEARCH,
             params=params,
-            expected_format="xml"
+            expected_format="bytes"
         )
         
-        # Extract supplier items from XML structure using the same parser as get_suppliers
-        suppliers = []
-        if "suppliers" in response:
-            supplier_items = response["suppliers"].get("supplier", [])
-            # Ensure we have a list even if only one item was returned
-            if not isinstance(supplier_items, list):
-                supplier_items = [supplier_items]
-                
-            # Process each supplier
-            for item in supplier_items:
-                supplier = {}
-                
-                # Map XML fields to dictionary
-                for field in ["id", "name", "code", "phone", "email", "inn"]:
-                    if field in item:
-                        # Map inn to taxId for consistency
-                        if field == "inn":
-                            supplier["taxId"] = item[field]
-                        else:
-                            supplier[field] = item[field]
-                
-                # Add to list if it's a valid supplier
-                if "id" in supplier:
-                    suppliers.append(supplier)
-        
-        return suppliers
+        return parse_flat_items(content, *_SUPPLIER_ITEMS, _SUPPLIER_FIELDS)
     
-    async def get_invoices(
+    async def iter_invoices(
         self,
         organization_id: str,
         from_date: str,
         to_date: str,
         document_type: str = "arrival"
-    ) -> List[Dict[str, Any]]:
+    ) -> AsyncIterator[Dict[str, Any]]:
         """
-        Get invoices from iiko.
+        Stream invoices from iiko one at a time.
+        
+        The response body is decoded incrementally, so memory stays flat no
+        matter how many invoices the date range contains.
         
         Args:
             organization_id: Restaurant/entity ID
@@ -417,8 +533,8 @@ class IikoClient:
             to_date: End date (format: YYYY-MM-DDThh:mm:ss)
             document_type: Document type (arrival for purchase invoices)
         
-        Returns:
-            List[Dict[str, Any]]: List of invoice data
+        Yields:
+            Dict[str, Any]: Invoice data
         """
         params = {
             "type": document_type,
@@ -426,23 +542,87 @@ class IikoClient:
             "from": from_date,
             "to": to_date
         }
-        # This endpoint probably returns JSON, but we'll use auto-detect
-        response = await self._make_request(
-            "GET", 
-            "api/invoices", 
-            auth_type="header", 
-            params=params,
-            expected_format="auto"
-        )
-        
-        # The response might be a list directly or nested under a root key
-        invoices = []
+        for attempt in range(2):
+            token, error = await self.auth.get_token()
+            if not token:
+                raise Exception(f"Failed to get authentication token: {error}")
+            refresh_gen = self._refresh_gen
+            
+            headers = {"Authorization": f"Bearer {token}"}
+            try:
+                async with self._client.stream("GET", _EP_INVOICES, params=params, headers=headers) as response:
+                    # If authentication error, refresh the token and retry once
+                    if response.status_code == 401 and attempt == 0:
+                        await self._refresh_token(refresh_gen)
+                        continue
+                    
+                    if response.is_error:
+                        await response.aread()
+                    response.raise_for_status()
+                    
+                    async for invoice in iter_json_items(response):
+                        yield invoice
+                    return
+            
+            except httpx.HTTPStatusError as e:
+                logger.error(f"HTTP error {e.response.status_code} for endpoint {_EP_INVOICES}: {e.response.text}")
+                raise Exception(f"HTTP error {e.response.status_code}: {e.response.text}")
+            
+            except httpx.RequestError as e:
+                logger.error(f"Request error for endpoint {_EP_INVOICES}: {str(e)}")
+                raise Exception(f"Network error during API request: {str(e)}")
+
+    async def iter_invoice_pages(
+        self,
+        organization_id: str,
+        from_date: str,
+        to_date: str,
+        document_type: str = "arrival",
+        page_size: int = 500
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Stream invoices from iiko in pages.
+
+        Args:
+            organization_id: Restaurant/entity ID
+            from_date: Start date (format: YYYY-MM-DDThh:mm:ss)
+            to_date: End date (format: YYYY-MM-DDThh:mm:ss)
+            document_type: Document type (arrival for purchase invoices)
+            page_size: Maximum number of invoices per page
+
+        Yields:
+            List[Dict[str, Any]]: Page of invoice data
+        """
+        page = []
+        async for invoice in self.iter_invoices(organization_id, from_date, to_date, document_type):
+            page.append(invoice)
+            if len(page) == page_size:
+                yield page
+                page = []
+        if page:
+            yield page
+
+    async def get_invoices(
+        self,
+        organization_id: str,
+        from_date: str,
+        to_date: str,
+        document_type: str = "arrival"
+    ) -> List[Dict[str, Any]]:
+        """
+        Get invoices from iiko.
         
-        if isinstance(response, list):
-            invoices = response
-        elif isinstance(response, dict) and "items" in response:
-            invoices = response["items"]
-        else:
-            logger.warning(f"Unexpected invoice response structure: {response.keys() if isinstance(response, dict) else type(response)}")
+        Args:
+            organization_id: Restaurant/entity ID
+            from_date: Start date (format: YYYY-MM-DDThh:mm:ss)
+            to_date: End date (format: YYYY-MM-DDThh:mm:ss)
+            document_type: Document type (arrival for purchase invoices)
         
-        return invoices
\ No newline at end of file
+        Returns:
+            List[Dict[str, Any]]: List of invoice data
+        """
+        return [
+            invoice async for invoice in self.iter_invoices(
+                organization_id, from_date, to_date, document_type
+            )
+        ]
@@ -5,13 +5,17 @@ This module orchestrates data synchronization between iiko and the internal syst
 """
 
 import uuid
+import asyncio
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Tuple
-from sqlalchemy.orm import Session
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from typing import Dict, List, Mapping, Optional, Any, Tuple
+from sqlalchemy import bindparam, func, insert, lambda_stmt, literal_column, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session, load_only
 
 from .iiko_client import IikoClient
-from .iiko_auth import IikoAuth
+from .iiko_auth import IikoAuth, get_auth_manager
 from .iiko_adapters import (
     adapt_iiko_restaurant_to_internal,
     adapt_iiko_store_to_internal,
@@ -31,6 +35,93 @@ from src.api.models.base import SyncStatus
 
 logger = logging.getLogger(__name__)
 
+# Number of entities written per transaction during a sync
+_BATCH = 100
+
+# Natural key of synced restaurants and suppliers, backed by a unique index
+_EXTERNAL_KEY = ("external_id", "external_system_type", "account_id")
+
+# Bookkeeping columns that change on every run; rows differing only here are left alone
+_VOLATILE_COLUMNS = frozenset({"external_last_synced_at"})
+
+# Scale of the synced Numeric(10, 2) amount columns
+_AMOUNT_SCALE = Decimal("0.01")
+
+# Restaurant columns needed to fetch and attach invoices
+_RESTAURANT_REF = load_only(Restaurant.id, Restaurant.external_id, Restaurant.external_system_type)
+
+# Lookups repeated for every page of invoices; lambda statements are built
+# and compiled once, then served from SQLAlchemy's statement cache
+_DEFAULT_UNIT = lambda_stmt(lambda: select(Unit.id).limit(1))
+_INVOICES_BY_NUMBER = lambda_stmt(lambda: select(
+    Invoice.id, Invoice.invoice_number, Invoice.supplier_id, Invoice.store_id, Invoice.invoice_date,
+    Invoice.due_date, Invoice.total_amount, Invoice.currency, Invoice.status
+).where(
+    Invoice.invoice_number.in_(bindparam("numbers", expanding=True))
+))
+_SUPPLIERS_BY_EXTERNAL_ID = lambda_stmt(lambda: select(Supplier.external_id, Supplier.id).where(
+    Supplier.account_id == bindparam("account_id"),
+    Supplier.external_system_type == "iiko",
+    Supplier.external_id.in_(bindparam("ids", expanding=True))
+))
+_STORE_FOR_RESTAURANT = lambda_stmt(lambda: select(Store.id).where(
+    Store.restaurant_id == bindparam("restaurant_id")
+).limit(1))
+
+# Maximum number of invoice requests in flight during sync_all
+_INVOICE_CONCURRENCY = 8
+
+
+def _date_range(
+    from_date: Optional[datetime],
+    to_date: Optional[datetime]
+) -> Tuple[str, str]:
+    """Format an invoice date range for the iiko API, defaulting to the last 30 days."""
+    # Set default date range if not provided
+    to_date = to_date or datetime.utcnow()
+    from_date = from_date or to_date - timedelta(days=30)
+    
+    # Format dates for iiko API (YYYY-MM-DDThh:mm:ss)
+    return from_date.isoformat(timespec="seconds"), to_date.isoformat(timespec="seconds")
+
+
+def _same_amount(current: Decimal, value: Any) -> bool:
+    """Whether an incoming amount is stored as the Decimal already held."""
+    # Numeric columns load as Decimals while the adapters supply floats; round the
+    # incoming value to the column scale the way the database stores it
+    try:
+        amount = Decimal(str(value)).quantize(_AMOUNT_SCALE, rounding=ROUND_HALF_UP)
+    except (InvalidOperation, ValueError):
+        return False
+    return current.quantize(_AMOUNT_SCALE, rounding=ROUND_HALF_UP) == amount
+
+
+def _is_unchanged(stored: Mapping[str, Any], attrs: Dict[str, Any]) -> bool:
+    """Whether a stored row already holds the synced attributes."""
+    for key, value in attrs.items():
+        if key in _VOLATILE_COLUMNS:
+            continue
+        current = stored.get(key)
+        if isinstance(current, Decimal):
+            if not _same_amount(current, value):
+                return False
+        # Ids arrive from the adapters as strings
+        elif current != value and str(current) != str(value):
+            return False
+    return True
+
+
+def _error_results(error: Exception) -> Dict[str, Any]:
+    """Build the sync results for a sync that failed as a whole."""
+    return {
+        "total": 0,
+        "created": 0,
+        "updated": 0,
+        "unchanged": 0,
+        "errors": 1,
+        "error_details": [{"error": str(error)}]
+    }
+
 
 class IikoSyncManager:
     """
@@ -62,9 +153,18 @@ class IikoSyncManager:
         self.db = db
         self.account_id = account_id
         
+        # Objects loaded before a batch commit (e.g. restaurants in sync_all) are
+        # read again afterwards; keep them loaded instead of re-selecting them
+        self.db.expire_on_commit = False
+        self.db.autoflush = False
+        
         # If client isn't provided, create one using account credentials
         if not iiko_client:
-            auth = self._load_auth_from_credentials(credential_id)
+            auth = get_auth_manager(
+                account_id,
+                credential_id,
+                lambda: self._load_auth_from_credentials(credential_id)
+            )
             self.client = IikoClient(auth_manager=auth)
         else:
             self.client = iiko_client
@@ -115,6 +215,111 @@ class IikoSyncManager:
             logger.error(f"Error loading iiko credentials: {str(e)}")
             raise
     
+    def _write_batch(
+        self,
+        model: Any,
+        to_insert: List[Dict[str, Any]],
+        to_update: List[Dict[str, Any]],
+        results: Dict[str, Any],
+        invoice_items: Optional[List[Dict[str, Any]]] = None
+    ) -> None:
+        """
+        Write a batch of collected rows and commit it.
+        
+        A failed batch is rolled back and its rows are counted as errors.
+        The row lists are emptied either way.
+        
+        Args:
+            model: Model class the rows belong to
+            to_insert: Attributes of new rows, including their ids
+            to_update: Attributes of existing rows, including their ids
+            results: Sync results to adjust if the batch fails
+            invoice_items: Optional invoice item rows to insert after invoices
+        """
+        try:
+            if to_insert:
+                self.db.bulk_insert_mappings(model, to_insert)
+            if to_update:
+                # One compiled UPDATE driven with executemany; "_id" keeps the
+                # key out of the SET clause
+                table = model.__table__
+                self.db.execute(
+                    update(table).where(table.c.id == bindparam("_id")),
+                    [
+                        {"_id": row["id"], **{k: v for k, v in row.items() if k != "id"}}
+                        for row in to_update
+                    ]
+                )
+            if invoice_items:
+                # Items of every invoice in the batch go out as one executemany
+                self.db.execute(insert(InvoiceItem.__table__), invoice_items)
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Error writing {model.__tablename__} batch: {str(e)}")
+            results["created"] -= len(to_insert)
+            results["updated"] -= len(to_update)
+            results["errors"] += len(to_insert) + len(to_update)
+            results["error_details"].append({"error": str(e)})
+        finally:
+            to_insert.clear()
+            to_update.clear()
+            if invoice_items:
+                invoice_items.clear()
+    
+    def _upsert_batch(
+        self,
+        model: Any,
+        rows: Dict[str, Dict[str, Any]],
+        results: Dict[str, Any]
+    ) -> None:
+        """
+        Insert or update a batch of rows keyed by their external id and commit it.
+        
+        Rows are matched on (external_id, external_system_type, account_id)
+        with INSERT ... ON CONFLICT DO UPDATE, so no lookup is needed first.
+        Existing rows whose values already match are not updated.
+        A failed batch is rolled back and its rows are counted as errors.
+        The rows are emptied either way.
+        
+        Args:
+            model: Model class with a unique index on its external key
+            rows: Attributes of the rows to write, keyed by external id
+            results: Sync results to update with the outcome
+        """
+        if not rows:
+            return
+        try:
+            stmt = pg_insert(model).values(list(rows.values()))
+            table = model.__table__
+            columns = [name for name in next(iter(rows.values())) if name not in _EXTERNAL_KEY]
+            compared = [name for name in columns if name not in _VOLATILE_COLUMNS]
+            stmt = stmt.on_conflict_do_update(
+                index_elements=_EXTERNAL_KEY,
+                set_={
+                    **{name: stmt.excluded[name] for name in columns},
+                    "updated_at": func.now()
+                },
+                # Leave rows that already hold the synced values untouched
+                where=tuple_(*(table.c[name] for name in compared)).is_distinct_from(
+                    tuple_(*(stmt.excluded[name] for name in compared))
+                )
+            ).returning(literal_column("xmax = 0"))
+            # xmax is 0 only for rows the statement inserted; unchanged rows are not returned
+            written = [is_new for (is_new,) in self.db.execute(stmt)]
+            self.db.commit()
+            inserted = sum(written)
+            results["created"] += inserted
+            results["updated"] += len(written) - inserted
+            results["unchanged"] += len(rows) - len(written)
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Error writing {model.__tablename__} batch: {str(e)}")
+            results["errors"] += len(rows)
+            results["error_details"].append({"error": str(e)})
+        finally:
+            rows.clear()
+    
     async def sync_restaurants(self) -> Dict[str, Any]:
         """
         Synchronize restaurants from iiko.
@@ -125,52 +330,54 @@ class IikoSyncManager:
         try:
             # Get restaurants from iiko
             iiko_restaurants = await self.client.get_restaurants()
-            
+        except Exception as e:
+            logger.error(f"Error in restaurant synchronization: {str(e)}")
+            return _error_results(e)
+        
+        return await asyncio.to_thread(self._apply_restaurants, iiko_restaurants)
+    
+    def _apply_restaurants(self, iiko_restaurants: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Write restaurants fetched from iiko to the database.
+        
+        Args:
+            iiko_restaurants: Restaurant records returned by iiko
+        
+        Returns:
+            Dict[str, Any]: Sync results
+        """
+        try:
             # Track results
             results = {
-                "total": len(iiko_restaurants),
+                "total": 0,
                 "created": 0,
                 "updated": 0,
+                "unchanged": 0,
                 "errors": 0,
                 "error_details": []
             }
             
-            # Process each restaurant
-            for iiko_data in iiko_restaurants:
+            # Collect rows by iiko id and upsert them in batches
+            rows: Dict[str, Dict[str, Any]] = {}
+            for index, iiko_data in enumerate(iiko_restaurants, 1):
+                if index % _BATCH == 0:
+                    self._upsert_batch(Restaurant, rows, results)
+                
+                # Skip inactive restaurants
+                if not iiko_data.get("isActive", True):
+                    continue
+                
+                results["total"] += 1
+                
                 try:
-                    # Skip inactive restaurants
-                    if not iiko_data.get("isActive", True):
-                        continue
-                    
                     # Convert to internal format
                     iiko_restaurant, internal_attrs = adapt_iiko_restaurant_to_internal(
                         iiko_data, 
                         self.account_id
                     )
-                    
-                    # Check if restaurant exists
-                    restaurant = self.db.query(Restaurant).filter(
-                        Restaurant.external_id == iiko_restaurant.iiko_id,
-                        Restaurant.external_system_type == "iiko",
-                        Restaurant.account_id == self.account_id
-                    ).first()
-                    
-                    if restaurant:
-                        # Update existing restaurant
-                        for key, value in internal_attrs.items():
-                            setattr(restaurant, key, value)
-                        results["updated"] += 1
-                    else:
-                        # Create new restaurant
-                        restaurant = Restaurant(**internal_attrs)
-                        self.db.add(restaurant)
-                        results["created"] += 1
-                    
-                    # Commit changes for this restaurant
-                    self.db.commit()
+                    rows[iiko_restaurant.iiko_id] = internal_attrs
                     
                 except Exception as e:
-                    self.db.rollback()
                     logger.error(f"Error syncing restaurant {iiko_data.get('id')}: {str(e)}")
                     results["errors"] += 1
                     results["error_details"].append({
@@ -178,17 +385,13 @@ class IikoSyncManager:
                         "error": str(e)
                     })
             
+            self._upsert_batch(Restaurant, rows, results)
             return results
             
         except Exception as e:
+            self.db.rollback()
             logger.error(f"Error in restaurant synchronization: {str(e)}")
-            return {
-                "total": 0,
-                "created": 0,
-                "updated": 0,
-                "errors": 1,
-                "error_details": [{"error": str(e)}]
-            }
+            return _error_results(e)
     
     async def sync_stores(self) -> Dict[str, Any]:
         """
@@ -200,33 +403,77 @@ class IikoSyncManager:
         try:
             # Get stores from iiko
             iiko_stores = await self.client.get_stores()
-            
+        except Exception as e:
+            logger.error(f"Error in store synchronization: {str(e)}")
+            return _error_results(e)
+        
+        return await asyncio.to_thread(self._apply_stores, iiko_stores)
+    
+    def _apply_stores(self, iiko_stores: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Write stores fetched from iiko to the database.
+        
+        Args:
+            iiko_stores: Store records returned by iiko
+        
+        Returns:
+            Dict[str, Any]: Sync results
+        """
+        try:
             # Track results
             results = {
-                "total": len(iiko_stores),
+                "total": 0,
                 "created": 0,
                 "updated": 0,
+                "unchanged": 0,
                 "errors": 0,
                 "error_details": []
             }
             
-            # Process each store
-            for iiko_data in iiko_stores:
+            # Load the stores we already have in one query
+            ids = [d.get("id") for d in iiko_stores if d.get("isActive", True)]
+            existing = {
+                (s.external_id, s.restaurant_id): s._mapping
+                for s in self.db.query(
+                    Store.id, Store.external_id, Store.restaurant_id, Store.name,
+                    Store.external_sync_status, Store.external_system_type, Store.external_metadata
+                ).filter(
+                    Store.external_system_type == "iiko",
+                    Store.external_id.in_(ids)
+                ).all()
+            }
+            
+            # Load the restaurants the stores belong to in one query
+            department_ids = {d.get("departmentId") for d in iiko_stores if d.get("departmentId")}
+            restaurants = {
+                r.external_id: r
+                for r in self.db.query(Restaurant.external_id, Restaurant.id).filter(
+                    Restaurant.external_system_type == "iiko",
+                    Restaurant.account_id == self.account_id,
+                    Restaurant.external_id.in_(department_ids)
+                ).all()
+            }
+            
+            # Collect rows and write them in batches
+            to_insert: List[Dict[str, Any]] = []
+            to_update: List[Dict[str, Any]] = []
+            for index, iiko_data in enumerate(iiko_stores, 1):
+                if index % _BATCH == 0:
+                    self._write_batch(Store, to_insert, to_update, results)
+                
+                # Skip inactive stores
+                if not iiko_data.get("isActive", True):
+                    continue
+                
+                results["total"] += 1
+                
                 try:
-                    # Skip inactive stores
-                    if not iiko_data.get("isActive", True):
-                        continue
-                    
                     # Find matching restaurant based on department ID
                     department_id = iiko_data.get("departmentId")
                     if not department_id:
                         continue
                     
-                    restaurant = self.db.query(Restaurant).filter(
-                        Restaurant.external_id == department_id,
-                        Restaurant.external_system_type == "iiko",
-                        Restaurant.account_id == self.account_id
-                    ).first()
+                    restaurant = restaurants.get(department_id)
                     
                     if not restaurant:
                         results["errors"] += 1
@@ -243,28 +490,24 @@ class IikoSyncManager:
                     )
                     
                     # Check if store exists
-                    store = self.db.query(Store).filter(
-                        Store.external_id == iiko_store.iiko_id,
-                        Store.external_system_type == "iiko",
-                        Store.restaurant_id == restaurant.id
-                    ).first()
+                    store_key = (iiko_store.iiko_id, restaurant.id)
+                    store = existing.get(store_key)
                     
-                    if store:
+                    if store and _is_unchanged(store, internal_attrs):
+                        results["unchanged"] += 1
+                    elif store:
                         # Update existing store
-                        for key, value in internal_attrs.items():
-                            setattr(store, key, value)
+                        internal_attrs["id"] = store["id"]
+                        to_update.append(internal_attrs)
                         results["updated"] += 1
                     else:
                         # Create new store
-                        store = Store(**internal_attrs)
-                        self.db.add(store)
+                        internal_attrs["id"] = uuid.uuid4()
+                        existing[store_key] = internal_attrs
+                        to_insert.append(internal_attrs)
                         results["created"] += 1
                     
-                    # Commit changes for this store
-                    self.db.commit()
-                    
                 except Exception as e:
-                    self.db.rollback()
                     logger.error(f"Error syncing store {iiko_data.get('id')}: {str(e)}")
                     results["errors"] += 1
                     results["error_details"].append({
@@ -272,17 +515,13 @@ class IikoSyncManager:
                         "error": str(e)
                     })
             
+            self._write_batch(Store, to_insert, to_update, results)
             return results
             
         except Exception as e:
+            self.db.rollback()
             logger.error(f"Error in store synchronization: {str(e)}")
-            return {
-                "total": 0,
-                "created": 0,
-                "updated": 0,
-                "errors": 1,
-                "error_details": [{"error": str(e)}]
-            }
+            return _error_results(e)
     
     async def sync_suppliers(self) -> Dict[str, Any]:
         """
@@ -294,52 +533,54 @@ class IikoSyncManager:
         try:
             # Get suppliers from iiko
             iiko_suppliers = await self.client.get_suppliers()
-            
+        except Exception as e:
+            logger.error(f"Error in supplier synchronization: {str(e)}")
+            return _error_results(e)
+        
+        return await asyncio.to_thread(self._apply_suppliers, iiko_suppliers)
+    
+    def _apply_suppliers(self, iiko_suppliers: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Write suppliers fetched from iiko to the database.
+        
+        Args:
+            iiko_suppliers: Supplier records returned by iiko
+        
+        Returns:
+            Dict[str, Any]: Sync results
+        """
+        try:
             # Track results
             results = {
-                "total": len(iiko_suppliers),
+                "total": 0,
                 "created": 0,
                 "updated": 0,
+                "unchanged": 0,
                 "errors": 0,
                 "error_details": []
             }
             
-            # Process each supplier
-            for iiko_data in iiko_suppliers:
+            # Collect rows by iiko id and upsert them in batches
+            rows: Dict[str, Dict[str, Any]] = {}
+            for index, iiko_data in enumerate(iiko_suppliers, 1):
+                if index % _BATCH == 0:
+                    self._upsert_batch(Supplier, rows, results)
+                
+                # Skip inactive suppliers
+                if not iiko_data.get("isActive", True):
+                    continue
+                
+                results["total"] += 1
+                
                 try:
-                    # Skip inactive suppliers
-                    if not iiko_data.get("isActive", True):
-                        continue
-                    
                     # Convert to internal format
                     iiko_supplier, internal_attrs = adapt_iiko_supplier_to_internal(
                         iiko_data, 
                         self.account_id
                     )
-                    
-                    # Check if supplier exists
-                    supplier = self.db.query(Supplier).filter(
-                        Supplier.external_id == iiko_supplier.iiko_id,
-                        Supplier.external_system_type == "iiko",
-                        Supplier.account_id == self.account_id
-                    ).first()
-                    
-                    if supplier:
-                        # Update existing supplier
-                        for key, value in internal_attrs.items():
-                            setattr(supplier, key, value)
-                        results["updated"] += 1
-                    else:
-                        # Create new supplier
-                        supplier = Supplier(**internal_attrs)
-                        self.db.add(supplier)
-                        results["created"] += 1
-                    
-                    # Commit changes for this supplier
-                    self.db.commit()
+                    rows[iiko_supplier.iiko_id] = internal_attrs
                     
                 except Exception as e:
-                    self.db.rollback()
                     logger.error(f"Error syncing supplier {iiko_data.get('id')}: {str(e)}")
                     results["errors"] += 1
                     results["error_details"].append({
@@ -347,17 +588,13 @@ class IikoSyncManager:
                         "error": str(e)
                     })
             
+            self._upsert_batch(Supplier, rows, results)
             return results
             
         except Exception as e:
+            self.db.rollback()
             logger.error(f"Error in supplier synchronization: {str(e)}")
-            return {
-                "total": 0,
-                "created": 0,
-                "updated": 0,
-                "errors": 1,
-                "error_details": [{"error": str(e)}]
-            }
+            return _error_results(e)
     
     async def sync_invoices(
         self,
@@ -368,6 +605,9 @@ class IikoSyncManager:
         """
         Synchronize invoices from iiko for a specific restaurant.
         
+        Invoices are streamed in pages; each page is written while the next
+        one downloads, with at most two pages buffered in between.
+        
         Args:
             restaurant_id: Internal restaurant ID
             from_date: Optional start date (defaults to 30 days ago)
@@ -377,109 +617,261 @@ class IikoSyncManager:
             Dict[str, Any]: Sync results
         """
         try:
-            # Set default date range if not provided
-            if not from_date:
-                from_date = datetime.now() - timedelta(days=30)
-            if not to_date:
-                to_date = datetime.now()
-            
-            # Format dates for iiko API
-            from_date_str = from_date.strftime("%Y-%m-%dT%H:%M:%S")
-            to_date_str = to_date.strftime("%Y-%m-%dT%H:%M:%S")
+            from_date_str, to_date_str = _date_range(from_date, to_date)
             
             # Get restaurant
-            restaurant = self.db.query(Restaurant).filter_by(id=restaurant_id).first()
+            restaurant = await asyncio.to_thread(
+                self.db.query(Restaurant).options(_RESTAURANT_REF).filter_by(id=restaurant_id).first
+            )
             if not restaurant or not restaurant.external_id or restaurant.external_system_type != "iiko":
                 raise Exception(f"Restaurant with ID {restaurant_id} not found or has no iiko_id")
             
-            # Get invoices from iiko
-            iiko_invoices = await self.client.get_invoices(
-                organization_id=restaurant.external_id,
-                from_date=from_date_str,
-                to_date=to_date_str
-            )
+        except Exception as e:
+            logger.error(f"Error in invoice synchronization: {str(e)}")
+            return _error_results(e)
+        
+        # Download pages in the background while the database writes them
+        pages: asyncio.Queue = asyncio.Queue(maxsize=2)
+        
+        async def produce() -> None:
+            # Pass download errors to the consumer; None marks the end
+            try:
+                async for page in self.client.iter_invoice_pages(
+                    organization_id=restaurant.external_id,
+                    from_date=from_date_str,
+                    to_date=to_date_str
+                ):
+                    await pages.put(page)
+            except Exception as e:
+                await pages.put(e)
+                return
+            await pages.put(None)
+        
+        # Track results
+        results = {
+            "total": 0,
+            "created": 0,
+            "updated": 0,
+            "unchanged": 0,
+            "errors": 0,
+            "error_details": []
+        }
+        producer = asyncio.create_task(produce())
+        try:
+            while (page := await pages.get()) is not None:
+                if isinstance(page, Exception):
+                    raise page
+                page_results = await asyncio.to_thread(self._apply_invoices, restaurant, page)
+                for key in ("total", "created", "updated", "unchanged", "errors"):
+                    results[key] += page_results[key]
+                results["error_details"].extend(page_results["error_details"])
+        except Exception as e:
+            producer.cancel()
+            logger.error(f"Error in invoice synchronization: {str(e)}")
+            results["errors"] += 1
+            results["error_details"].append({"error": str(e)})
+        
+        return results
+    
+    async def sync_all(
+        self,
+        from_date: Optional[datetime] = None,
+        to_date: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """
+        Synchronize restaurants, stores, suppliers and invoices from iiko.
+        
+        The reference lists are fetched concurrently, then invoices are
+        fetched for every iiko restaurant of the account with at most
+        _INVOICE_CONCURRENCY requests in flight. Each result is written in
+        a worker thread as soon as it arrives, so the remaining requests
+        keep running while the database works. Writes stay sequential on
+        the manager's session.
+        
+        Args:
+            from_date: Optional invoice start date (defaults to 30 days ago)
+            to_date: Optional invoice end date (defaults to now)
             
+        Returns:
+            Dict[str, Any]: Sync results per entity; invoice results are keyed by restaurant ID
+        """
+        results: Dict[str, Any] = {}
+        
+        # Fetch the reference lists concurrently and write them in dependency order
+        fetches = [
+            ("restaurants", asyncio.ensure_future(self.client.get_restaurants()), self._apply_restaurants),
+            ("stores", asyncio.ensure_future(self.client.get_stores()), self._apply_stores),
+            ("suppliers", asyncio.ensure_future(self.client.get_suppliers()), self._apply_suppliers),
+        ]
+        for name, fetch, apply in fetches:
+            try:
+                data = await fetch
+            except Exception as e:
+                logger.error(f"Error fetching iiko {name}: {str(e)}")
+                results[name] = _error_results(e)
+            else:
+                results[name] = await asyncio.to_thread(apply, data)
+        
+        # Fetch invoices for every restaurant linked to iiko
+        from_date_str, to_date_str = _date_range(from_date, to_date)
+        restaurants = await asyncio.to_thread(
+            self.db.query(Restaurant).options(_RESTAURANT_REF).filter(
+                Restaurant.external_system_type == "iiko",
+                Restaurant.account_id == self.account_id,
+                Restaurant.external_id.isnot(None)
+            ).all
+        )
+        semaphore = asyncio.Semaphore(_INVOICE_CONCURRENCY)
+        
+        async def fetch_invoices(restaurant: Restaurant) -> Tuple[Restaurant, Any]:
+            async with semaphore:
+                try:
+                    return restaurant, await self.client.get_invoices(
+                        organization_id=restaurant.external_id,
+                        from_date=from_date_str,
+                        to_date=to_date_str
+                    )
+                except Exception as e:
+                    return restaurant, e
+        
+        results["invoices"] = {}
+        for fetch in asyncio.as_completed([fetch_invoices(restaurant) for restaurant in restaurants]):
+            restaurant, data = await fetch
+            if isinstance(data, Exception):
+                logger.error(f"Error fetching iiko invoices for restaurant {restaurant.id}: {str(data)}")
+                results["invoices"][str(restaurant.id)] = _error_results(data)
+            else:
+                results["invoices"][str(restaurant.id)] = await asyncio.to_thread(
+                    self._apply_invoices, restaurant, data
+                )
+        
+        return results
+    
+    def _apply_invoices(self, restaurant: Restaurant, iiko_invoices: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Write invoices fetched from iiko for a restaurant to the database.
+        
+        Args:
+            restaurant: Restaurant the invoices belong to
+            iiko_invoices: Invoice records returned by iiko
+        
+        Returns:
+            Dict[str, Any]: Sync results
+        """
+        try:
             # Track results
             results = {
-                "total": len(iiko_invoices),
+                "total": 0,
                 "created": 0,
                 "updated": 0,
+                "unchanged": 0,
                 "errors": 0,
                 "error_details": []
             }
             
-            # Process each invoice
-            for iiko_data in iiko_invoices:
+            # Find the unit assigned to invoice items
+            # For simplicity, we're assuming a default unit exists - in a real implementation,
+            # you would need to match or create appropriate units based on iiko data
+            default_unit = self.db.execute(_DEFAULT_UNIT).first()
+            if not default_unit:
+                raise Exception("No units available in the system")
+            default_unit_id = default_unit.id
+            
+            # Load the invoices we already have in one query
+            numbers = [d.get("number") for d in iiko_invoices if d.get("number")]
+            existing = {
+                (i.invoice_number, i.supplier_id, i.store_id): i._mapping
+                for i in self.db.execute(_INVOICES_BY_NUMBER, {"numbers": numbers})
+            }
+            
+            # Load the referenced suppliers in one query
+            supplier_ids = {d.get("supplierId") for d in iiko_invoices if d.get("supplierId")}
+            suppliers = {
+                s.external_id: s
+                for s in self.db.execute(
+                    _SUPPLIERS_BY_EXTERNAL_ID,
+                    {"account_id": self.account_id, "ids": list(supplier_ids)}
+                )
+            }
+            
+            # Find the store associated with this restaurant
+            store = self.db.execute(_STORE_FOR_RESTAURANT, {"restaurant_id": restaurant.id}).first()
+            
+            # Collect rows and write them in batches; new invoices get their
+            # ids up front so their items can be inserted in the same batch
+            to_insert: List[Dict[str, Any]] = []
+            to_update: List[Dict[str, Any]] = []
+            items: List[Dict[str, Any]] = []
+            for index, iiko_data in enumerate(iiko_invoices, 1):
+                if index % _BATCH == 0:
+                    self._write_batch(Invoice, to_insert, to_update, results, items)
+                
+                # Read the fields the lookups need once
+                entity_id = iiko_data.get("id")
+                number = iiko_data.get("number")
+                supplier_id = iiko_data.get("supplierId")
+                department_id = iiko_data.get("departmentId")
+                
                 try:
                     # Skip invoices without a number
-                    if not iiko_data.get("number"):
+                    if not number:
                         continue
                     
+                    results["total"] += 1
+                    
                     # Find supplier based on supplier ID
-                    supplier_id = iiko_data.get("supplierId")
                     if not supplier_id:
                         results["errors"] += 1
                         results["error_details"].append({
-                            "entity_id": iiko_data.get("id"),
+                            "entity_id": entity_id,
                             "error": "Invoice has no supplier ID"
                         })
                         continue
                     
-                    supplier = self.db.query(Supplier).filter(
-                        Supplier.external_id == supplier_id,
-                        Supplier.external_system_type == "iiko",
-                        Supplier.account_id == self.account_id
-                    ).first()
+                    supplier = suppliers.get(supplier_id)
                     
                     if not supplier:
                         results["errors"] += 1
                         results["error_details"].append({
-                            "entity_id": iiko_data.get("id"),
+                            "entity_id": entity_id,
                             "error": f"Supplier with iiko_id {supplier_id} not found"
                         })
                         continue
                     
                     # Find store based on department ID
-                    department_id = iiko_data.get("departmentId")
                     if not department_id:
                         results["errors"] += 1
                         results["error_details"].append({
-                            "entity_id": iiko_data.get("id"),
+                            "entity_id": entity_id,
                             "error": "Invoice has no department ID"
                         })
                         continue
                     
-                    # Find the store associated with this department/restaurant
-                    store = self.db.query(Store).filter(
-                        Store.restaurant_id == restaurant.id
-                    ).first()
-                    
                     if not store:
                         results["errors"] += 1
                         results["error_details"].append({
-                            "entity_id": iiko_data.get("id"),
+                            "entity_id": entity_id,
                             "error": f"No store found for restaurant {restaurant.id}"
                         })
                         continue
                     
                     # Convert to internal format
-                    iiko_invoice, invoice_attrs, invoice_item_attrs = adapt_iiko_invoice_to_internal(
+                    _, invoice_attrs, invoice_item_attrs = adapt_iiko_invoice_to_internal(
                         iiko_data,
                         str(supplier.id),
                         str(store.id)
                     )
                     
                     # Check if invoice exists
-                    invoice = self.db.query(Invoice).filter(
-                        Invoice.invoice_number == iiko_invoice.number,
-                        Invoice.supplier_id == supplier.id,
-                        Invoice.store_id == store.id
-                    ).first()
+                    invoice_key = (number, supplier.id, store.id)
+                    invoice = existing.get(invoice_key)
                     
-                    if invoice:
+                    if invoice and _is_unchanged(invoice, invoice_attrs):
+                        results["unchanged"] += 1
+                    elif invoice:
                         # Update existing invoice
-                        for key, value in invoice_attrs.items():
-                            setattr(invoice, key, value)
+                        invoice_attrs["id"] = invoice["id"]
+                        to_update.append(invoice_attrs)
                         results["updated"] += 1
                         
                         # TODO: Handle updating invoice items
@@ -487,48 +879,30 @@ class IikoSyncManager:
                         
                     else:
                         # Create new invoice
-                        invoice = Invoice(**invoice_attrs)
-                        self.db.add(invoice)
-                        self.db.flush()  # Get ID for new invoice
+                        invoice_attrs["id"] = uuid.uuid4()
+                        existing[invoice_key] = invoice_attrs
+                        to_insert.append(invoice_attrs)
                         results["created"] += 1
                         
                         # Create invoice items
                         for item_attrs in invoice_item_attrs:
-                            # Find or create the appropriate unit
-                            # For simplicity, we're assuming a default unit exists - in a real implementation,
-                            # you would need to match or create appropriate units based on iiko data
-                            default_unit = self.db.query(Unit).first()
-                            if not default_unit:
-                                raise Exception("No units available in the system")
-                            
                             # Add invoice and unit IDs to item attributes
-                            item_attrs["invoice_id"] = invoice.id
-                            item_attrs["unit_id"] = default_unit.id
-                            
-                            # Create invoice item
-                            invoice_item = InvoiceItem(**item_attrs)
-                            self.db.add(invoice_item)
-                    
-                    # Commit changes for this invoice
-                    self.db.commit()
+                            item_attrs["invoice_id"] = invoice_attrs["id"]
+                            item_attrs["unit_id"] = default_unit_id
+                            items.append(item_attrs)
                     
                 except Exception as e:
-                    self.db.rollback()
-                    logger.error(f"Error syncing invoice {iiko_data.get('id')}: {str(e)}")
+                    logger.error(f"Error syncing invoice {entity_id}: {str(e)}")
                     results["errors"] += 1
                     results["error_details"].append({
-                        "entity_id": iiko_data.get("id"),
+                        "entity_id": entity_id,
                         "error": str(e)
                     })
             
+            self._write_batch(Invoice, to_insert, to_update, results, items)
             return results
             
         except Exception as e:
+            self.db.rollback()
             logger.error(f"Error in invoice synchronization: {str(e)}")
-            return {
-                "total": 0,
-                "created": 0,
-                "updated": 0,
-                "errors": 1,
-                "error_details": [{"error": str(e)}]
-            }
\ No newline at end of file
+            return _error_results(e)
\ No newline at end of file
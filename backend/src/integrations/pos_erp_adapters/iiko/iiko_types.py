@@ -7,12 +7,16 @@ This module contains Pydantic models for iiko API data structures.
 from datetime import datetime
 from typing import Dict, List, Optional, Any, Union
 from uuid import UUID
-from pydantic import BaseModel, Field
+import msgspec
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class IikoBase(BaseModel):
     """Base model for iiko entities."""
     
+    # Built once per API record and only read afterwards
+    model_config = ConfigDict(frozen=True, extra="ignore")
+    
     iiko_id: str = Field(..., description="iiko identifier")
     iiko_metadata: Dict[str, Any] = Field(default_factory=dict, description="Raw iiko data")
 
@@ -64,8 +68,14 @@ class IikoSupplier(IikoBase):
     contact_person: Optional[str] = None
 
 
-class IikoInvoiceItem(BaseModel):
-    """Model representing an item in an iiko invoice."""
+class IikoInvoiceItem(msgspec.Struct, gc=False, frozen=True):
+    """
+    Model representing an item in an iiko invoice.
+    
+    A msgspec struct rather than a Pydantic model, since invoices carry many
+    lines. Structs don't validate on construction, so the adapter coerces each
+    field and rejects lines without a product ID before building one.
+    """
     
     product_id: str
     product_name: str
@@ -83,6 +93,8 @@ class IikoInvoice(IikoBase):
     Maps to internal Invoice model.
     """
     
+    model_config = ConfigDict(frozen=True, extra="ignore", arbitrary_types_allowed=True)
+    
     number: str
     supplier_id: str
     department_id: str  # References iiko restaurant/department
@@ -14,74 +14,196 @@ Usage:
 """
 
 import ast
+import io
 import os
 import sys
-import json
+import pickle
+import hashlib
+import inspect
 import argparse
+import builtins
+import fnmatch
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Set, Any, Optional
-from collections import defaultdict
+from typing import Dict, List, Set, Any, Optional, BinaryIO, TextIO
+from collections import defaultdict, namedtuple
 import re
 
-class CodeAnalyzer(ast.NodeVisitor):
-    """AST visitor to analyze Python code structure and usage."""
+
+def _usage_json(entry: List) -> Dict[str, Any]:
+    """Render a [count, samples] usage entry for the JSON report.
+    
+    Usage tuples are expanded into dicts; import records already are.
+    """
+    count, samples = entry
+    return {
+        'count': count,
+        'samples': [record._asdict() if isinstance(record, tuple) else record for record in samples]
+    }
+
+
+_encode = None
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize a value to compact JSON bytes, using orjson when installed.
+    
+    The encoder is imported on first use, so text reports and --help never load it.
+    """
+    global _encode
+    if _encode is None:
+        try:
+            import orjson
+            _encode = orjson.dumps
+        except ImportError:
+            import json
+            _encode = lambda value: json.dumps(value).encode('utf-8')
+    return _encode(obj)
+
+
+# Directories that hold generated, vendored or fixture code rather than the codebase itself
+DEFAULT_EXCLUDE = ['migrations', 'venv', '.venv', 'node_modules', '__pycache__', 'tests/fixtures']
+
+# Usages are kept as [count, samples]: every occurrence is counted, but only
+# this many records are kept per symbol, since the report shows a few examples
+MAX_USAGE_SAMPLES = 64
+
+# Compact usage records; a tuple takes a fraction of the memory of a dict
+Usage = namedtuple('Usage', ['type', 'line', 'file'])
+MethodUsage = namedtuple('MethodUsage', ['type', 'object', 'method', 'line', 'file'])
+
+# Builtins can never refer to a class or function defined in the codebase
+_BUILTIN_SKIP = frozenset(dir(builtins)) | {'self', 'cls'}
+
+
+# Bound once so the per-node checks skip the module attribute lookups
+_ClassDef = ast.ClassDef
+_FunctionDef = ast.FunctionDef
+_Name = ast.Name
+_Attribute = ast.Attribute
+_Load = ast.Load
+_iter_child_nodes = ast.iter_child_nodes
+_Expr = ast.Expr
+_Constant = ast.Constant
+
+
+def _raw_docstring(node: ast.AST) -> str:
+    """Return a definition's docstring uncleaned, or '' if it has none."""
+    body = node.body
+    if body and type(body[0]) is _Expr:
+        value = body[0].value
+        if type(value) is _Constant and type(value.value) is str:
+            return value.value
+    return ''
+
+
+def first_docstring_line(docstring: str) -> str:
+    """Return the first line of a raw docstring, without indentation."""
+    return docstring.lstrip().partition('\n')[0]
+
+
+def _merge_usage_entry(target: List, entry: List):
+    """Add a [count, samples] usage entry into another, respecting the sample cap."""
+    target[0] += entry[0]
+    room = MAX_USAGE_SAMPLES - len(target[1])
+    if room > 0:
+        target[1].extend(entry[1][:room])
+
+
+class CodeAnalyzer:
+    """Analyze Python code structure and usage in a single AST pass.
+    
+    Docstrings are stored raw; the reports clean them only when rendering.
+    """
     
     def __init__(self, file_path: str):
-        self.file_path = file_path
+        # Every record of the file shares this one string object, and pickle's
+        # memo keeps that sharing when results come back from a worker or the cache
+        self.file_path = sys.intern(file_path)
+        # Names the module defines or imports; only these can refer to a class
+        # or function from the codebase, unless the module uses a star import
+        self.bound_names = set()
+        self.has_star_import = False
         self.classes = {}
         self.functions = {}
         self.imports = {}
         self.class_methods = defaultdict(list)
-        self.current_class = None
-        self.usages = defaultdict(list)
+        self.usages = {}
+    
+    def visit(self, tree: ast.AST):
+        """Walk the tree in source order, dispatching on node type.
+        
+        Uses an explicit stack instead of NodeVisitor's recursive
+        generic_visit, carrying whether each node sits inside a class.
+        """
+        handlers = self._handlers
+        stack = [(tree, False)]
+        while stack:
+            node, in_class = stack.pop()
+            handler = handlers.get(type(node))
+            if handler is not None:
+                handler(self, node, in_class)
+            if type(node) is _Name:
+                continue
+            children = list(_iter_child_nodes(node))
+            if children:
+                in_class = in_class or type(node) is _ClassDef
+                children.reverse()
+                stack.extend([(child, in_class) for child in children])
+        
+        # Drop references to names the module neither defines nor imports
+        if not self.has_star_import:
+            bound_names = self.bound_names
+            self.usages = {
+                name: usages for name, usages in self.usages.items()
+                if name in bound_names or '.' in name
+            }
         
-    def visit_ClassDef(self, node):
-        """Visit class definitions."""
-        self.current_class = node.name
+    def _handle_class(self, node, in_class):
+        """Record a class definition and its methods."""
         class_info = {
             'name': node.name,
             'line': node.lineno,
-            'docstring': ast.get_docstring(node) or '',
+            'docstring': _raw_docstring(node),
             'methods': [],
-            'bases': [base.id if isinstance(base, ast.Name) else str(base) for base in node.bases],
+            # Stored as source text so the report never has to serialize AST nodes
+            'bases': [base.id if isinstance(base, _Name) else ast.unparse(base) for base in node.bases],
             'file': self.file_path
         }
         self.classes[node.name] = class_info
+        self.bound_names.add(node.name)
         
-        # Visit methods within this class
+        # Methods are the functions directly in the class body
         for item in node.body:
-            if isinstance(item, ast.FunctionDef):
+            if type(item) is _FunctionDef:
                 method_info = {
                     'name': item.name,
                     'line': item.lineno,
-                    'docstring': ast.get_docstring(item) or '',
+                    'docstring': _raw_docstring(item),
                     'args': [arg.arg for arg in item.args.args],
                     'class': node.name,
                     'file': self.file_path
                 }
                 class_info['methods'].append(method_info)
                 self.class_methods[node.name].append(item.name)
-        
-        self.generic_visit(node)
-        self.current_class = None
     
-    def visit_FunctionDef(self, node):
-        """Visit function definitions (not in classes)."""
-        if self.current_class is None:  # Only top-level functions
+    def _handle_function(self, node, in_class):
+        """Record function definitions (not in classes)."""
+        self.bound_names.add(node.name)
+        if not in_class:
             func_info = {
                 'name': node.name,
                 'line': node.lineno,
-                'docstring': ast.get_docstring(node) or '',
+                'docstring': _raw_docstring(node),
                 'args': [arg.arg for arg in node.args.args],
                 'file': self.file_path
             }
             self.functions[node.name] = func_info
-        
-        self.generic_visit(node)
     
-    def visit_Import(self, node):
-        """Visit import statements."""
+    def _handle_import(self, node, in_class):
+        """Record import statements."""
         for alias in node.names:
+            self.bound_names.add(alias.asname or alias.name.partition('.')[0])
             self.imports[alias.name] = {
                 'type': 'import',
                 'module': alias.name,
@@ -90,10 +212,14 @@ class CodeAnalyzer(ast.NodeVisitor):
                 'file': self.file_path
             }
     
-    def visit_ImportFrom(self, node):
-        """Visit from...import statements."""
+    def _handle_import_from(self, node, in_class):
+        """Record from...import statements."""
         module = node.module or ''
         for alias in node.names:
+            if alias.name == '*':
+                self.has_star_import = True
+            else:
+                self.bound_names.add(alias.asname or alias.name)
             import_key = f"{module}.{alias.name}" if module else alias.name
             self.imports[import_key] = {
                 'type': 'from_import',
@@ -104,238 +230,445 @@ class CodeAnalyzer(ast.NodeVisitor):
                 'file': self.file_path
             }
     
-    def visit_Call(self, node):
-        """Visit function/method calls to track usage."""
-        if isinstance(node.func, ast.Name):
+    def _handle_async_function(self, node, in_class):
+        """Note async function names, which may be referenced elsewhere in the module."""
+        self.bound_names.add(node.name)
+    
+    def _record_usage(self, key: str, usage: tuple):
+        """Count a usage of a symbol, keeping the record while under the sample cap."""
+        entry = self.usages.get(key)
+        if entry is None:
+            self.usages[key] = [1, [usage]]
+        else:
+            entry[0] += 1
+            if len(entry[1]) < MAX_USAGE_SAMPLES:
+                entry[1].append(usage)
+    
+    def _handle_call(self, node, in_class):
+        """Record function/method calls to track usage."""
+        func = node.func
+        func_type = type(func)
+        if func_type is _Name:
             # Direct function call
-            self.usages[node.func.id].append({
-                'type': 'function_call',
-                'line': node.lineno,
-                'file': self.file_path
-            })
-        elif isinstance(node.func, ast.Attribute):
+            if func.id not in _BUILTIN_SKIP:
+                self._record_usage(func.id, Usage('function_call', node.lineno, self.file_path))
+        elif func_type is _Attribute:
             # Method call (obj.method())
-            if isinstance(node.func.value, ast.Name):
-                usage_key = f"{node.func.value.id}.{node.func.attr}"
-                self.usages[usage_key].append({
-                    'type': 'method_call',
-                    'object': node.func.value.id,
-                    'method': node.func.attr,
-                    'line': node.lineno,
-                    'file': self.file_path
-                })
-        
-        self.generic_visit(node)
+            if type(func.value) is _Name:
+                usage_key = f"{func.value.id}.{func.attr}"
+                self._record_usage(
+                    usage_key,
+                    MethodUsage('method_call', func.value.id, func.attr, node.lineno, self.file_path)
+                )
     
-    def visit_Name(self, node):
-        """Visit name references (variable access)."""
-        if isinstance(node.ctx, ast.Load):  # Only when loading/reading the name
-            self.usages[node.id].append({
-                'type': 'name_reference',
-                'line': node.lineno,
-                'file': self.file_path
-            })
+    def _handle_name(self, node, in_class):
+        """Record name references (variable access)."""
+        # Only when loading/reading a name that can be a class or function
+        if type(node.ctx) is _Load and node.id not in _BUILTIN_SKIP:
+            self._record_usage(node.id, Usage('name_reference', node.lineno, self.file_path))
+    
+    _handlers = {
+        ast.ClassDef: _handle_class,
+        ast.FunctionDef: _handle_function,
+        ast.AsyncFunctionDef: _handle_async_function,
+        ast.Import: _handle_import,
+        ast.ImportFrom: _handle_import_from,
+        ast.Call: _handle_call,
+        ast.Name: _handle_name,
+    }
+
+
+def analyze_source(file_path: str, content: bytes) -> Optional[Dict[str, Any]]:
+    """Analyze the source of a single Python file.
+
+    Runs in a worker process, so it returns the collected data as plain dicts
+    rather than the visitor itself.
+    """
+    try:
+        tree = compile(content, file_path, 'exec', ast.PyCF_ONLY_AST)
+        analyzer = CodeAnalyzer(file_path)
+        analyzer.visit(tree)
         
-        self.generic_visit(node)
+        return {
+            'file': analyzer.file_path,
+            'classes': analyzer.classes,
+            'functions': analyzer.functions,
+            'imports': analyzer.imports,
+            'usages': analyzer.usages
+        }
+    except (SyntaxError, UnicodeDecodeError) as e:
+        print(f"Error analyzing {file_path}: {e}")
+        return None
+
+
+def analyze_source_blob(file_path: str, content: bytes) -> Optional[bytes]:
+    """Analyze a file in a pool worker and return the result already pickled.
+    
+    The parent stores the blob in the cache as-is and unpickles it once, so
+    each result is serialized a single time on its way back.
+    """
+    result = analyze_source(file_path, content)
+    return pickle.dumps(result, pickle.HIGHEST_PROTOCOL) if result else None
+
+
+def analyze_file(file_path: Path, root_path: Path) -> Optional[Dict[str, Any]]:
+    """Analyze a single Python file."""
+    return analyze_source(str(file_path.relative_to(root_path)), file_path.read_bytes())
+
+
+class AnalysisCache:
+    """SQLite cache of per-file analysis results keyed by path and content hash."""
+    
+    # Bump whenever the shape of the per-file results changes
+    VERSION = 3
+    
+    def __init__(self, cache_path: str):
+        # Imported here so --no-cache runs never load sqlite3
+        import sqlite3
+        self.conn = sqlite3.connect(cache_path)
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != self.VERSION:
+            self.conn.execute("DROP TABLE IF EXISTS files")
+            self.conn.execute(f"PRAGMA user_version = {self.VERSION}")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            "path TEXT, sha TEXT, blob BLOB, PRIMARY KEY (path, sha))"
+        )
+    
+    def get(self, path: str, sha: str) -> Optional[Dict[str, Any]]:
+        """Return the cached analysis for this version of the file, if any."""
+        row = self.conn.execute(
+            "SELECT blob FROM files WHERE path = ? AND sha = ?", (path, sha)
+        ).fetchone()
+        return pickle.loads(row[0]) if row else None
+    
+    def put_many(self, entries: List[tuple]):
+        """Store (path, sha, pickled result) entries, replacing older versions of each file."""
+        with self.conn:
+            self.conn.executemany("DELETE FROM files WHERE path = ?", [(path,) for path, _, _ in entries])
+            self.conn.executemany("INSERT OR REPLACE INTO files (path, sha, blob) VALUES (?, ?, ?)", entries)
+    
+    def close(self):
+        self.conn.close()
 
 
 class UsageTracker:
     """Track usage of classes and methods across the codebase."""
     
-    def __init__(self, root_path: str):
+    def __init__(
+        self,
+        root_path: str,
+        cache: Optional[AnalysisCache] = None,
+        exclude: Optional[List[str]] = None
+    ):
         self.root_path = Path(root_path)
+        self.cache = cache
+        self.exclude = DEFAULT_EXCLUDE if exclude is None else exclude
         self.analyzers = {}
         self.global_classes = {}
         self.global_functions = {}
-        self.usage_map = defaultdict(list)
+        self.usage_map = {}
+        self._usage_cache = {}
+        self._class_methods = {}
+        self._method_to_classes = {}
+        self._method_calls_by_class = {}
+        self._imports_by_name = {}
         
-    def analyze_file(self, file_path: Path) -> Optional[CodeAnalyzer]:
+    def analyze_file(self, file_path: Path) -> Optional[Dict[str, Any]]:
         """Analyze a single Python file."""
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            tree = ast.parse(content)
-            analyzer = CodeAnalyzer(str(file_path.relative_to(self.root_path)))
-            analyzer.visit(tree)
+        return analyze_file(file_path, self.root_path)
+    
+    def _is_excluded(self, rel_dir: str, name: str) -> bool:
+        """Whether a directory matches an exclude pattern.
+        
+        Patterns without a slash match the directory name; patterns with one
+        match the end of its path relative to the root.
+        """
+        for pattern in self.exclude:
+            if '/' in pattern:
+                if fnmatch.fnmatch(rel_dir, pattern) or fnmatch.fnmatch(rel_dir, '*/' + pattern):
+                    return True
+            elif fnmatch.fnmatch(name, pattern):
+                return True
+        return False
+    
+    def _iter_python_files(self, directory: Path):
+        """Yield (full path, path relative to the root) for each Python file under a directory."""
+        root = str(self.root_path)
+        for dirpath, dirnames, filenames in os.walk(directory):
+            # One relpath per directory; it gives the same result however the root is spelled
+            rel_dirpath = os.path.relpath(dirpath, root)
+            prefix = '' if rel_dirpath == '.' else rel_dirpath + os.sep
             
-            return analyzer
-        except (SyntaxError, UnicodeDecodeError) as e:
-            print(f"Error analyzing {file_path}: {e}")
-            return None
+            # Pruning here means excluded trees are never even listed
+            dirnames[:] = sorted(
+                d for d in dirnames
+                if not d.startswith('.')
+                and not self._is_excluded(prefix + d, d)
+            )
+            for filename in sorted(filenames):
+                if filename.endswith('.py') and not filename.startswith('.'):
+                    yield os.path.join(dirpath, filename), prefix + filename
     
-    def analyze_directory(self, directory: Path, pattern: str = "**/*.py"):
+    def analyze_directory(self, directory: Path):
         """Analyze all Python files in a directory."""
         print(f"Analyzing directory: {directory}")
         
-        for file_path in directory.glob(pattern):
-            if file_path.is_file() and not file_path.name.startswith('.'):
-                analyzer = self.analyze_file(file_path)
-                if analyzer:
-                    self.analyzers[str(file_path.relative_to(self.root_path))] = analyzer
-                    
-                    # Merge into global collections
-                    self.global_classes.update(analyzer.classes)
-                    self.global_functions.update(analyzer.functions)
-                    
-                    # Merge usage information
-                    for usage_key, usages in analyzer.usages.items():
-                        self.usage_map[usage_key].extend(usages)
-    
-    def find_class_usage(self, class_name: str) -> Dict[str, List[Dict]]:
-        """Find all usages of a specific class."""
-        usages = defaultdict(list)
+        results = []
+        pending = []
+        for full_path, rel_path in self._iter_python_files(directory):
+            with open(full_path, 'rb') as f:
+                content = f.read()
+            sha = hashlib.sha256(content).hexdigest()
+            cached = self.cache.get(rel_path, sha) if self.cache else None
+            if not cached:
+                # Keep the file's place so results merge in discovery order
+                pending.append((len(results), rel_path, sha, content))
+            results.append(cached)
         
-        # Direct class references
-        if class_name in self.usage_map:
-            usages['direct_references'] = self.usage_map[class_name]
+        # Each changed file is an independent, CPU-bound parse, so spread them over all cores
+        if pending:
+            positions, paths, shas, contents = zip(*pending)
+            with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+                blobs = list(executor.map(analyze_source_blob, paths, contents, chunksize=32))
+            
+            for position, blob in zip(positions, blobs):
+                if blob:
+                    results[position] = pickle.loads(blob)
+            if self.cache:
+                self.cache.put_many([
+                    (path, sha, blob) for path, sha, blob in zip(paths, shas, blobs) if blob
+                ])
+        
+        usage_map = self.usage_map
+        for result in results:
+            if result:
+                # The usage entries move into usage_map, so the per-file entry keeps none
+                file_usages = result.pop('usages')
+                self.analyzers[result['file']] = result
+                
+                # Merge into global collections
+                self.global_classes.update(result['classes'])
+                self.global_functions.update(result['functions'])
+                
+                # Merge usage information, adopting the file's entry for new keys
+                for usage_key, entry in file_usages.items():
+                    merged = usage_map.get(usage_key)
+                    if merged is None:
+                        usage_map[usage_key] = entry
+                    else:
+                        _merge_usage_entry(merged, entry)
+        
+        self._build_indexes()
+    
+    def _build_indexes(self):
+        """Index method calls and imports by class once all files are merged."""
+        self._usage_cache = {}
+        
+        self._class_methods = {
+            class_name: frozenset(method['name'] for method in class_info['methods'])
+            for class_name, class_info in self.global_classes.items()
+        }
+        
+        self._method_to_classes = defaultdict(list)
+        classes_by_lower = defaultdict(list)
+        for class_name, methods in self._class_methods.items():
+            classes_by_lower[class_name.lower()].append(class_name)
+            for method in methods:
+                self._method_to_classes[method].append(class_name)
         
         # Method calls on class instances
-        for usage_key, usage_list in self.usage_map.items():
+        self._method_calls_by_class = defaultdict(lambda: [0, []])
+        for usage_key, entry in self.usage_map.items():
             if '.' in usage_key:
                 obj, method = usage_key.split('.', 1)
                 # This is a simplified heuristic - in practice, you'd need more sophisticated analysis
-                if obj.lower() == class_name.lower() or method in self.get_class_methods(class_name):
-                    usages['method_calls'].extend(usage_list)
+                matched = set(classes_by_lower.get(obj.lower(), ()))
+                matched.update(self._method_to_classes.get(method, ()))
+                for class_name in matched:
+                    _merge_usage_entry(self._method_calls_by_class[class_name], entry)
         
-        # Import statements
+        # Import statements, keyed by the class they import; only classes are ever looked up
+        self._imports_by_name = defaultdict(list)
+        global_classes = self.global_classes
         for analyzer in self.analyzers.values():
-            for import_key, import_info in analyzer.imports.items():
-                if class_name in import_key:
-                    usages['imports'].append(import_info)
+            for import_key, import_info in analyzer['imports'].items():
+                name = import_key.rpartition('.')[2]
+                if name in global_classes:
+                    self._imports_by_name[name].append(import_info)
+    
+    def find_class_usage(self, class_name: str) -> Dict[str, List]:
+        """Find all usages of a specific class, as [count, samples] per usage type."""
+        if class_name in self._usage_cache:
+            return self._usage_cache[class_name]
+        
+        usages = {}
+        
+        # Direct class references
+        if class_name in self.usage_map:
+            usages['direct_references'] = self.usage_map[class_name]
+        
+        if class_name in self._method_calls_by_class:
+            usages['method_calls'] = self._method_calls_by_class[class_name]
+        
+        if class_name in self._imports_by_name:
+            imports = self._imports_by_name[class_name]
+            usages['imports'] = [len(imports), imports]
         
-        return dict(usages)
+        self._usage_cache[class_name] = usages
+        return usages
     
-    def get_class_methods(self, class_name: str) -> List[str]:
-        """Get all methods for a class."""
-        if class_name in self.global_classes:
-            return [method['name'] for method in self.global_classes[class_name]['methods']]
-        return []
+    def get_class_methods(self, class_name: str) -> frozenset:
+        """Get the names of all methods of a class."""
+        return self._class_methods.get(class_name, frozenset())
     
     def generate_report(self, output_format: str = 'text') -> str:
         """Generate a comprehensive usage report."""
         if output_format == 'json':
-            return self._generate_json_report()
+            buffer = io.BytesIO()
+            self.write_json_report(buffer)
+            return buffer.getvalue().decode('utf-8')
         else:
-            return self._generate_text_report()
-    
-    def _generate_text_report(self) -> str:
-        """Generate a human-readable text report."""
-        report = []
-        report.append("=" * 80)
-        report.append("CODE USAGE ANALYSIS REPORT")
-        report.append("=" * 80)
-        report.append()
+            buffer = io.StringIO()
+            self.write_text_report(buffer)
+            return buffer.getvalue()
+    
+    def write_text_report(self, out: TextIO):
+        """Write a human-readable text report."""
+        write = out.write
+        write("=" * 80 + "\n")
+        write("CODE USAGE ANALYSIS REPORT\n")
+        write("=" * 80 + "\n")
+        write("\n")
         
         # Classes summary
-        report.append(f"CLASSES FOUND: {len(self.global_classes)}")
-        report.append("-" * 40)
+        write(f"CLASSES FOUND: {len(self.global_classes)}\n")
+        write("-" * 40 + "\n")
         
+        unused = set()
         for class_name, class_info in sorted(self.global_classes.items()):
-            report.append(f"\n📋 Class: {class_name}")
-            report.append(f"   File: {class_info['file']}:{class_info['line']}")
-            report.append(f"   Methods: {len(class_info['methods'])}")
+            write(f"\n📋 Class: {class_name}\n")
+            write(f"   File: {class_info['file']}:{class_info['line']}\n")
+            write(f"   Methods: {len(class_info['methods'])}\n")
             
-            if class_info['docstring']:
-                # First line of docstring
-                first_line = class_info['docstring'].split('\n')[0]
-                report.append(f"   Description: {first_line}")
+            # First line of docstring
+            first_line = first_docstring_line(class_info['docstring'])
+            if first_line:
+                write(f"   Description: {first_line}\n")
             
             # Show methods
             for method in class_info['methods'][:5]:  # Show first 5 methods
-                report.append(f"     • {method['name']}() - line {method['line']}")
+                write(f"     • {method['name']}() - line {method['line']}\n")
             
             if len(class_info['methods']) > 5:
-                report.append(f"     ... and {len(class_info['methods']) - 5} more methods")
+                write(f"     ... and {len(class_info['methods']) - 5} more methods\n")
             
             # Show usage
             usage = self.find_class_usage(class_name)
-            total_usages = sum(len(usage_list) for usage_list in usage.values())
+            total_usages = sum(count for count, _ in usage.values())
             
             if total_usages > 0:
-                report.append(f"   📊 Total Usages: {total_usages}")
+                write(f"   📊 Total Usages: {total_usages}\n")
                 
                 # Show some usage examples
-                for usage_type, usage_list in usage.items():
-                    if usage_list and usage_type != 'imports':
-                        report.append(f"     {usage_type}: {len(usage_list)} occurrences")
-                        for usage in usage_list[:3]:  # Show first 3 examples
-                            report.append(f"       - {usage['file']}:{usage['line']}")
-                        if len(usage_list) > 3:
-                            report.append(f"       ... and {len(usage_list) - 3} more")
+                for usage_type, (count, samples) in usage.items():
+                    if count and usage_type != 'imports':
+                        write(f"     {usage_type}: {count} occurrences\n")
+                        for usage in samples[:3]:  # Show first 3 examples
+                            write(f"       - {usage.file}:{usage.line}\n")
+                        if count > 3:
+                            write(f"       ... and {count - 3} more\n")
             else:
-                report.append("   ⚠️  No usages found (might be unused)")
+                write("   ⚠️  No usages found (might be unused)\n")
+                unused.add(class_name)
         
         # Functions summary
-        report.append(f"\n\nFUNCTIONS FOUND: {len(self.global_functions)}")
-        report.append("-" * 40)
+        write(f"\n\nFUNCTIONS FOUND: {len(self.global_functions)}\n")
+        write("-" * 40 + "\n")
         
         for func_name, func_info in sorted(self.global_functions.items()):
-            report.append(f"\n🔧 Function: {func_name}")
-            report.append(f"   File: {func_info['file']}:{func_info['line']}")
+            write(f"\n🔧 Function: {func_name}\n")
+            write(f"   File: {func_info['file']}:{func_info['line']}\n")
             
-            if func_info['docstring']:
-                first_line = func_info['docstring'].split('\n')[0]
-                report.append(f"   Description: {first_line}")
+            first_line = first_docstring_line(func_info['docstring'])
+            if first_line:
+                write(f"   Description: {first_line}\n")
             
             # Show usage
             if func_name in self.usage_map:
-                usages = self.usage_map[func_name]
-                report.append(f"   📊 Usages: {len(usages)}")
-                for usage in usages[:3]:
-                    report.append(f"     - {usage['file']}:{usage['line']}")
-                if len(usages) > 3:
-                    report.append(f"     ... and {len(usages) - 3} more")
+                count, samples = self.usage_map[func_name]
+                write(f"   📊 Usages: {count}\n")
+                for usage in samples[:3]:
+                    write(f"     - {usage.file}:{usage.line}\n")
+                if count > 3:
+                    write(f"     ... and {count - 3} more\n")
             else:
-                report.append("   ⚠️  No usages found")
+                write("   ⚠️  No usages found\n")
         
         # Summary statistics
-        report.append(f"\n\nSUMMARY STATISTICS")
-        report.append("-" * 40)
-        report.append(f"Total files analyzed: {len(self.analyzers)}")
-        report.append(f"Total classes: {len(self.global_classes)}")
-        report.append(f"Total functions: {len(self.global_functions)}")
-        report.append(f"Total methods: {sum(len(cls['methods']) for cls in self.global_classes.values())}")
+        write(f"\n\nSUMMARY STATISTICS\n")
+        write("-" * 40 + "\n")
+        write(f"Total files analyzed: {len(self.analyzers)}\n")
+        write(f"Total classes: {len(self.global_classes)}\n")
+        write(f"Total functions: {len(self.global_functions)}\n")
+        write(f"Total methods: {sum(len(cls['methods']) for cls in self.global_classes.values())}\n")
         
-        # Potentially unused classes
-        unused_classes = []
-        for class_name in self.global_classes:
-            usage = self.find_class_usage(class_name)
-            total_usages = sum(len(usage_list) for usage_list in usage.values())
-            if total_usages == 0:
-                unused_classes.append(class_name)
+        # Potentially unused classes, found while listing the classes above
+        unused_classes = [class_name for class_name in self.global_classes if class_name in unused]
         
         if unused_classes:
-            report.append(f"\n⚠️  POTENTIALLY UNUSED CLASSES: {len(unused_classes)}")
+            write(f"\n⚠️  POTENTIALLY UNUSED CLASSES: {len(unused_classes)}\n")
             for class_name in unused_classes:
-                report.append(f"   - {class_name}")
+                write(f"   - {class_name}\n")
+    
+    def write_json_report(self, fp: BinaryIO):
+        """Write a JSON report for programmatic use.
         
-        return '\n'.join(report)
-    
-    def _generate_json_report(self) -> str:
-        """Generate a JSON report for programmatic use."""
-        report_data = {
-            'summary': {
-                'files_analyzed': len(self.analyzers),
-                'classes_found': len(self.global_classes),
-                'functions_found': len(self.global_functions),
-                'total_methods': sum(len(cls['methods']) for cls in self.global_classes.values())
-            },
-            'classes': {},
-            'functions': self.global_functions,
-            'usage_map': dict(self.usage_map)
+        Classes, functions and usages are serialized one entry at a time, so
+        the whole report never has to exist in memory as a single string.
+        """
+        summary = {
+            'files_analyzed': len(self.analyzers),
+            'classes_found': len(self.global_classes),
+            'functions_found': len(self.global_functions),
+            'total_methods': sum(len(cls['methods']) for cls in self.global_classes.values())
         }
-        
-        # Add usage information to classes
+        fp.write(b'{"summary":' + _dumps(summary) + b',\n"classes":')
+        self._write_json_object(fp, self._class_records())
+        fp.write(b',\n"functions":')
+        self._write_json_object(fp, (
+            (func_name, {**func_info, 'docstring': inspect.cleandoc(func_info['docstring'])})
+            for func_name, func_info in self.global_functions.items()
+        ))
+        fp.write(b',\n"usage_map":')
+        self._write_json_object(fp, (
+            (usage_key, _usage_json(entry)) for usage_key, entry in self.usage_map.items()
+        ))
+        fp.write(b'}\n')
+    
+    def _class_records(self):
+        """Yield each class with its usage information added."""
         for class_name, class_info in self.global_classes.items():
             usage = self.find_class_usage(class_name)
-            report_data['classes'][class_name] = {
+            yield class_name, {
                 **class_info,
-                'usage': usage,
-                'total_usages': sum(len(usage_list) for usage_list in usage.values())
+                'docstring': inspect.cleandoc(class_info['docstring']),
+                'methods': [
+                    {**method, 'docstring': inspect.cleandoc(method['docstring'])}
+                    for method in class_info['methods']
+                ],
+                'usage': {usage_type: _usage_json(entry) for usage_type, entry in usage.items()},
+                'total_usages': sum(count for count, _ in usage.values())
             }
-        
-        return json.dumps(report_data, indent=2, default=str)
+    
+    @staticmethod
+    def _write_json_object(fp: BinaryIO, items):
+        """Write (key, value) pairs as a JSON object, one member per line."""
+        fp.write(b'{')
+        separator = b'\n'
+        for key, value in items:
+            fp.write(separator + _dumps(key) + b':' + _dumps(value))
+            separator = b',\n'
+        fp.write(b'}')
 
 
 def main():
@@ -345,37 +678,50 @@ def main():
     parser.add_argument('--output-format', choices=['text', 'json'], default='text', 
                        help='Output format')
     parser.add_argument('--output-file', help='Output file (default: stdout)')
+    parser.add_argument('--cache-file', default='.analyze_cache.sqlite',
+                       help='Cache of per-file results reused for unchanged files')
+    parser.add_argument('--no-cache', action='store_true', help='Re-analyze every file')
+    parser.add_argument('--exclude', nargs='*', default=DEFAULT_EXCLUDE,
+                       help='Directory names or relative paths (glob patterns allowed) to skip')
     
     args = parser.parse_args()
     
+    # Validate the paths before opening the cache or building anything
     root_path = Path(args.root)
     if not root_path.exists():
         print(f"Error: Root path {root_path} does not exist")
         sys.exit(1)
     
-    tracker = UsageTracker(root_path)
+    # Analyze a specific module, or all Python files
+    target_path = root_path / args.module if args.module else root_path
+    if not target_path.exists():
+        print(f"Error: Module path {target_path} does not exist")
+        sys.exit(1)
     
-    if args.module:
-        # Analyze specific module
-        module_path = root_path / args.module
-        if module_path.exists():
-            tracker.analyze_directory(module_path)
-        else:
-            print(f"Error: Module path {module_path} does not exist")
-            sys.exit(1)
-    else:
-        # Analyze all Python files
-        tracker.analyze_directory(root_path)
+    cache = None if args.no_cache else AnalysisCache(args.cache_file)
+    tracker = UsageTracker(root_path, cache, args.exclude)
+    tracker.analyze_directory(target_path)
+    
+    if cache:
+        cache.close()
     
     # Generate report
-    report = tracker.generate_report(args.output_format)
+    if args.output_format == 'json':
+        if args.output_file:
+            with open(args.output_file, 'wb') as f:
+                tracker.write_json_report(f)
+            print(f"Report generated: {args.output_file}")
+        else:
+            sys.stdout.flush()
+            tracker.write_json_report(sys.stdout.buffer)
+        return
     
     if args.output_file:
         with open(args.output_file, 'w') as f:
-            f.write(report)
+            tracker.write_text_report(f)
         print(f"Report generated: {args.output_file}")
     else:
-        print(report)
+        tracker.write_text_report(sys.stdout)
 
 
 if __name__ == '__main__':
@@ -11,6 +11,7 @@ Sets up a Telegram bot instance with the GetInn platform:
 
 Usage:
     python -m src.scripts.bots.setup.telegram_bot_setup [--debug]
+    WEBHOOK_MODE=direct python -m src.scripts.bots.setup.telegram_bot_setup  # api | direct | auto (default)
 
 Requirements:
     - telegram_token.txt file containing a valid Telegram bot token
@@ -20,13 +21,28 @@ Requirements:
 import os
 import sys
 import json
-import requests
+import httpx
 import logging
+import logging.handlers
+import atexit
 import time
-from urllib.parse import urljoin
+import random
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from argparse import ArgumentParser
 from pathlib import Path
 
+try:
+    import orjson
+    
+    def pretty_json(data):
+        """Indent JSON for debug logs using orjson's C encoder"""
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+except ImportError:
+    def pretty_json(data):
+        """Indent JSON for debug logs"""
+        return json.dumps(data, indent=2)
+
 # Set up argument parser
 parser = ArgumentParser(description='Telegram Bot Setup Script')
 parser.add_argument('--debug', action='store_true', help='Enable debug logging')
@@ -34,63 +50,137 @@ args = parser.parse_args()
 
 # Set up logging
 log_level = logging.DEBUG if args.debug else logging.INFO
+log_handler = logging.StreamHandler(sys.stdout)
+log_handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
+if not args.debug:
+    # Write INFO output in batches; errors flush immediately. Debug output stays unbuffered
+    log_handler = logging.handlers.MemoryHandler(capacity=100, flushLevel=logging.ERROR, target=log_handler)
+    atexit.register(log_handler.flush)
 logging.basicConfig(
     level=log_level,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[logging.StreamHandler(sys.stdout)]
+    handlers=[log_handler]
 )
 logger = logging.getLogger(__name__)
+# API calls are logged by our own hooks; httpx's request lines would also expose the Telegram bot token
+logging.getLogger("httpx").setLevel(logging.WARNING)
+logging.getLogger("httpcore").setLevel(logging.WARNING)
 
 # Base API URL and token file
 BASE_URL = "http://localhost:8000"
+
+# Endpoint URLs, built once; per-bot/account ones are filled in with str.format
+AUTH_TOKEN_URL = f"{BASE_URL}/v1/api/auth/test-token"
+ACCOUNTS_URL = f"{BASE_URL}/v1/api/accounts"
+ACCOUNT_BOTS_URL_TPL = f"{BASE_URL}/v1/api/accounts/{{account_id}}/bots"
+BOTS_URL = f"{BASE_URL}/v1/api/bots"
+BOT_PLATFORMS_URL_TPL = f"{BASE_URL}/v1/api/bots/{{bot_id}}/platforms"
+BOT_SCENARIOS_URL_TPL = f"{BASE_URL}/v1/api/bots/{{bot_id}}/scenarios"
+BOT_SCENARIO_UPLOAD_URL_TPL = f"{BASE_URL}/v1/api/bots/{{bot_id}}/scenarios/upload"
+TELEGRAM_WEBHOOK_SET_URL_TPL = f"{BASE_URL}/v1/api/webhooks/telegram/{{bot_id}}/set"
+NGROK_TUNNELS_URL = "http://localhost:4040/api/tunnels"
+
+# How set_ngrok_webhook reaches Telegram: "api", "direct" or "auto" (API server, then direct)
+WEBHOOK_MODE = os.environ.get("WEBHOOK_MODE", "auto")
+if WEBHOOK_MODE not in ("api", "direct", "auto"):
+    logger.warning(f"Unknown WEBHOOK_MODE '{WEBHOOK_MODE}', using 'auto'")
+    WEBHOOK_MODE = "auto"
+# Set in auto mode once the API server fails to set the webhook, so later calls go direct
+_webhook_api_unavailable = False
+
+# Names the test bot has been created under
+KNOWN_BOT_NAMES = frozenset({"Telegram Test Bot", "Test Telegram Bot"})
 # Use absolute paths
 ROOT_DIR = Path(os.path.dirname(os.path.realpath(__file__))).parents[3]  # 4 levels up to reach backend/
 TOKEN_FILE = str(ROOT_DIR / "telegram_token.txt")
 
-# Custom request session to log API calls
-class LoggingSession(requests.Session):
-    """Custom session that logs all API calls for debugging"""
+# Gateway errors worth another attempt
+RETRY_STATUSES = frozenset({502, 503, 504})
+
+def retry(max_attempts=3, initial=0.5, factor=2.0, max_delay=30.0, exceptions=(httpx.TransportError,), statuses=frozenset()):
+    """Decorator retrying a call on transient errors or retryable statuses with jittered exponential backoff"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            for attempt in range(max_attempts):
+                last_attempt = attempt == max_attempts - 1
+                try:
+                    result = func(*args, **kwargs)
+                except exceptions as e:
+                    if last_attempt:
+                        logger.error(f"All {max_attempts} attempts failed. Last error: {str(e)}")
+                        raise
+                    reason = str(e)
+                else:
+                    # The last response is returned as-is so callers can report the status
+                    if last_attempt or getattr(result, "status_code", None) not in statuses:
+                        return result
+                    reason = f"status {result.status_code}"
+                # Spread each delay over 0.5x-1.5x so concurrent runs don't retry in lockstep
+                delay = min(max_delay, initial * factor ** attempt) * (0.5 + random.random())
+                logger.warning(f"Attempt {attempt + 1} failed: {reason}. Retrying in {delay:.2f}s...")
+                time.sleep(delay)
+        return wrapper
+    return decorator
+
+class RetryingClient(httpx.Client):
+    """HTTP/2 client with a keep-alive connection pool that retries transient failures"""
+    
+    def __init__(self, **kwargs):
+        super().__init__(
+            http2=True,
+            limits=httpx.Limits(max_connections=8, max_keepalive_connections=4),
+            timeout=10,
+            follow_redirects=True,
+            **kwargs
+        )
+    
+    @retry(statuses=RETRY_STATUSES)
+    def request(self, method, url, **kwargs):
+        return super().request(method, url, **kwargs)
+
+def log_request(request):
+    """Event hook that logs every API call for debugging"""
+    logger.info(f"\n=== REQUEST ===\n{request.method} {request.url}")
     
-    def request(self, method, url, *args, **kwargs):
-        # Log the request
-        request_data = kwargs.get('json', kwargs.get('data', None))
-        logger.info(f"\n=== REQUEST ===\n{method} {url}")
+    # Payload and curl command are only built when they will be printed
+    if logger.isEnabledFor(logging.DEBUG):
+        request_data = request.content.decode("utf-8", errors="replace")
         if request_data:
-            logger.info(f"Request Data: {json.dumps(request_data, indent=2)}")
+            try:
+                logger.debug(f"Request Data: {pretty_json(json.loads(request.content))}")
+            except ValueError:
+                logger.debug(f"Request Data: {request_data}")
             
         # Generate curl command for debugging
-        curl_command = f"curl -X {method} '{url}'"
-        headers = kwargs.get('headers', {})
-        for key, value in headers.items():
-            curl_command += f" -H '{key}: {value}'"
-            
+        curl_command = f"curl -X {request.method} '{request.url}'"
+        for key, value in request.headers.items():
+            if key not in ("host", "content-length"):
+                curl_command += f" -H '{key}: {value}'"
+                
         if request_data:
-            if isinstance(request_data, dict):
-                curl_command += f" -d '{json.dumps(request_data)}'"
-            else:
-                curl_command += f" -d '{request_data}'"
+            curl_command += f" -d '{request_data}'"
                 
-        logger.info(f"CURL Equivalent: {curl_command}")
-        
-        # Make the actual request
+        logger.debug(f"CURL Equivalent: {curl_command}")
+
+def log_response(response):
+    """Event hook that logs every API response for debugging"""
+    logger.info(f"\n=== RESPONSE ===\nStatus Code: {response.status_code}")
+    if logger.isEnabledFor(logging.DEBUG):
+        # Hooks run before the body is read
+        response.read()
         try:
-            response = super().request(method, url, *args, **kwargs)
-            
-            # Log the response
-            logger.info(f"\n=== RESPONSE ===\nStatus Code: {response.status_code}")
-            try:
-                response_data = response.json()
-                logger.info(f"Response Data: {json.dumps(response_data, indent=2)}")
-            except:
-                logger.info(f"Response Text: {response.text}")
-                
-            return response
-        except Exception as e:
-            logger.error(f"Request failed: {str(e)}")
-            raise
-            
-# Create a session with logging
-session = LoggingSession()
+            response_data = response.json()
+            # Hand the parsed body to the caller instead of decoding it a second time
+            response.json = lambda **kwargs: response_data
+            logger.debug(f"Response Data: {pretty_json(response_data)}")
+        except ValueError:
+            logger.debug("Response Text: %s", response.text)
+
+# Create a client with logging; every call to the API server and ngrok goes through it
+session = RetryingClient(event_hooks={"request": [log_request], "response": [log_response]})
+
+# Separate client for api.telegram.org; not logged, since its URLs contain the bot token
+telegram_session = RetryingClient()
 
 class APIError(Exception):
     """Custom exception for API errors"""
@@ -115,48 +205,27 @@ def check_response(response, operation_name):
         logger.error(f"Error during {operation_name}: {response.status_code} - {response.text}")
         return False
 
+@functools.lru_cache(maxsize=8)
+def _load_text(path_str, mtime_ns):
+    """Read a text file; memoized by path and mtime so unchanged files are read once"""
+    with open(path_str, "r", encoding="utf-8") as f:
+        return f.read()
+
 def read_token_file():
     """Read telegram token from file"""
     try:
-        with open(TOKEN_FILE, "r") as f:
-            token = f.read().strip()
-            if not token:
-                logger.error(f"Token file {TOKEN_FILE} is empty")
-                sys.exit(1)
-            return token
+        token = _load_text(TOKEN_FILE, os.stat(TOKEN_FILE).st_mtime_ns).strip()
+        if not token:
+            logger.error(f"Token file {TOKEN_FILE} is empty")
+            sys.exit(1)
+        return token
     except FileNotFoundError:
         logger.error(f"Token file {TOKEN_FILE} not found")
         sys.exit(1)
 
-def with_retry(func, *args, max_retries=3, initial_delay=2, **kwargs):
-    """Execute a function with retry logic"""
-    retry_count = 0
-    retry_delay = initial_delay
-    last_error = None
-    
-    while retry_count < max_retries:
-        try:
-            return func(*args, **kwargs)
-        except Exception as e:
-            last_error = e
-            retry_count += 1
-            if retry_count < max_retries:
-                logger.warning(f"Attempt {retry_count} failed: {str(e)}. Retrying in {retry_delay}s...")
-                time.sleep(retry_delay)
-                retry_delay *= 2  # Exponential backoff
-            else:
-                logger.error(f"All {max_retries} attempts failed. Last error: {str(e)}")
-                break
-    
-    # If we get here, all retries failed
-    if last_error:
-        raise last_error
-    else:
-        raise APIError(f"Failed after {max_retries} attempts")
-
 def get_auth_token():
     """Get a test authentication token"""
-    url = urljoin(BASE_URL, "/v1/api/auth/test-token")
+    url = AUTH_TOKEN_URL
     try:
         response = session.post(url, json={}, timeout=5)
         
@@ -176,26 +245,32 @@ def get_auth_token():
         logger.error(f"Error getting authentication token: {str(e)}")
         sys.exit(1)
 
-def get_direct_token():
-    """Get a fresh authentication token using direct request"""
-    try:
-        auth_response = requests.post(
-            urljoin(BASE_URL, "/v1/api/auth/test-token"),
-            json={},
-            timeout=5
-        )
-        
-        if auth_response.status_code != 200:
-            return None
+def get_bots(account_id):
+    """List the account's bots, refreshing the session token and retrying once if it was rejected"""
+    params = {"account_id": account_id}
+    response = session.get(BOTS_URL, params=params, timeout=5)
+    
+    if response.status_code == 401:
+        logger.info("Session token rejected for bot query, refreshing it...")
+        get_auth_token()
+        response = session.get(BOTS_URL, params=params, timeout=5)
             
-        return auth_response.json().get("access_token")
-    except Exception:
-        return None
+    return response
+
+def find_test_bot(bot_instances):
+    """Pick the "Telegram Test Bot" from a bot list, or the first bot if there is none"""
+    for bot in bot_instances:
+        if bot.get("name") in KNOWN_BOT_NAMES:
+            logger.info(f"Found existing Telegram Test Bot with ID: {bot.get('id')}")
+            return bot
+            
+    logger.info(f"Using existing bot: {bot_instances[0].get('name')} ({bot_instances[0].get('id')})")
+    return bot_instances[0]
 
 def get_account_by_name(account_name="Test Account"):
     """Get account with the specified name - if API fails, use default account ID"""
     try:
-        url = urljoin(BASE_URL, "/v1/api/accounts")
+        url = ACCOUNTS_URL
         response = session.get(url, timeout=5)
         
         if not check_response(response, "get_accounts"):
@@ -219,7 +294,7 @@ def get_account_by_name(account_name="Test Account"):
 def create_account(name):
     """Create a new account with the specified name - handle errors gracefully"""
     try:
-        url = urljoin(BASE_URL, "/v1/api/accounts")
+        url = ACCOUNTS_URL
         account_data = {
             "name": name,
             "description": "Created by Python API script"
@@ -240,44 +315,8 @@ def create_account(name):
 
 def get_bot_instance(account_id):
     """Get bot instance for the specified account - handle API errors gracefully"""
-    # First try with direct API call to handle connection issues
-    logger.info("Getting a fresh authentication token for bot query...")
-    direct_token = get_direct_token()
-    
-    if direct_token:
-        logger.info("Successfully obtained direct authentication token for bot query")
-        try:
-            # Use direct requests call with fresh token
-            headers = {"Authorization": f"Bearer {direct_token}"}
-            bot_url = urljoin(BASE_URL, f"/v1/api/bots")
-            direct_response = requests.get(
-                bot_url, 
-                params={"account_id": account_id}, 
-                headers=headers,
-                timeout=5
-            )
-            
-            if direct_response.status_code == 200:
-                bot_instances = direct_response.json()
-                logger.info(f"Successfully got bots via direct API call. Found {len(bot_instances)} bot instance(s)")
-                
-                # Look for a bot named "Telegram Test Bot" or "Test Telegram Bot"
-                for bot in bot_instances:
-                    if bot.get("name") == "Telegram Test Bot" or bot.get("name") == "Test Telegram Bot":
-                        logger.info(f"Found existing Telegram Test Bot with ID: {bot.get('id')}")
-                        return bot
-                
-                # If no specifically named bot found but we have bots, return the first one
-                if bot_instances:
-                    logger.info(f"Using existing bot: {bot_instances[0].get('name')} ({bot_instances[0].get('id')})")
-                    return bot_instances[0]
-        except Exception as direct_e:
-            logger.warning(f"Error with direct bot query: {direct_e}")
-    
-    # Fall back to original method if direct call fails
     try:
-        url = urljoin(BASE_URL, f"/v1/api/bots")
-        response = session.get(url, params={"account_id": account_id}, timeout=5)
+        response = get_bots(account_id)
         
         if not check_response(response, "get_bot_instances"):
             logger.warning("Failed to get bot instances")
@@ -289,113 +328,49 @@ def get_bot_instance(account_id):
             return None
             
         logger.info(f"Found {len(bot_instances)} bot instance(s) for account {account_id}")
-        
-        # Look for a bot named "Telegram Test Bot" or "Test Telegram Bot"
-        for bot in bot_instances:
-            if bot.get("name") == "Telegram Test Bot" or bot.get("name") == "Test Telegram Bot":
-                logger.info(f"Found existing Telegram Test Bot with ID: {bot.get('id')}")
-                return bot
-                
-        # If no specifically named bot found, return first one
-        return bot_instances[0]
+        return find_test_bot(bot_instances)
     except Exception as e:
         logger.warning(f"Error getting bot instances: {e}")
         return None
 
-def create_bot_instance(account_id):
+def create_bot_instance(account_id, name="Telegram Test Bot"):
     """Create a new bot instance for the account - handle errors gracefully"""
-    # Double-check for existing bots before creating a new one
-    logger.info("Double-checking for existing bots before creating new one...")
-    direct_token = get_direct_token()
-    
-    if direct_token:
-        try:
-            # Use direct requests call with fresh token
-            headers = {"Authorization": f"Bearer {direct_token}"}
-            bot_url = urljoin(BASE_URL, f"/v1/api/bots")
-            direct_response = requests.get(
-                bot_url,
-                params={"account_id": account_id},
-                headers=headers,
-                timeout=5
-            )
-            
-            if direct_response.status_code == 200:
-                bot_instances = direct_response.json()
-                if bot_instances:
-                    logger.info(f"Found existing bots via direct check - not creating a duplicate")
-                    # Look for a Telegram Test Bot
-                    for bot in bot_instances:
-                        if bot.get("name") == "Telegram Test Bot" or bot.get("name") == "Test Telegram Bot":
-                            logger.info(f"Found existing Telegram Test Bot with ID: {bot.get('id')}")
-                            return bot
-                    
-                    # Return the first bot if no specific name match
-                    logger.info(f"Using first available bot (ID: {bot_instances[0].get('id')}) instead of creating new one")
-                    return bot_instances[0]
-        except Exception as direct_e:
-            logger.warning(f"Error with direct bot check: {direct_e}")
-    
-    # If we reach here, we need to create a new bot
     bot_data = {
-        "name": "Telegram Test Bot",
+        "name": name,
         "description": "Test bot created via Python API script",
         "account_id": account_id
     }
     
-    # Try with primary endpoint first
     try:
-        url = urljoin(BASE_URL, f"/v1/api/accounts/{account_id}/bots")
+        url = ACCOUNT_BOTS_URL_TPL.format(account_id=account_id)
         response = session.post(url, json=bot_data, timeout=5)
         
         if response.status_code in (200, 201):
             logger.info("Successfully created new bot instance")
             return response.json()
-            
-        # If primary endpoint fails, try alternative
-        logger.warning(f"Failed with primary endpoint: {response.text}")
-        logger.info("Trying alternative endpoint...")
         
-        alt_url = urljoin(BASE_URL, f"/v1/api/bots")
-        response = session.post(alt_url, json=bot_data, timeout=5)
-        
-        if response.status_code in (200, 201):
-            logger.info("Successfully created new bot instance using alternative endpoint")
-            return response.json()
-        
-        logger.error("Failed to create bot instance")
-        return {"id": "placeholder-bot-id", "name": "Telegram Test Bot"}
+        logger.error(f"Failed to create bot instance: {response.text}")
+        return {"id": "placeholder-bot-id", "name": name}
     except Exception as e:
         logger.error(f"Failed to create bot instance: {str(e)}")
-        return {"id": "placeholder-bot-id", "name": "Telegram Test Bot"}
+        return {"id": "placeholder-bot-id", "name": name}
 
-def get_platform_credentials(bot_id):
-    """Get platform credentials for the bot instance - handle API errors gracefully"""
-    try:
-        url = urljoin(BASE_URL, f"/v1/api/bots/{bot_id}/platforms")
-        response = session.get(url, timeout=5)
+def ensure_bot_instance(account_id, name="Telegram Test Bot"):
+    """Get the account's bot, creating one only if the account has none"""
+    bot_instance = get_bot_instance(account_id)
+    if bot_instance:
+        return bot_instance
         
-        if not check_response(response, "get_platform_credentials"):
-            logger.warning("Failed to get platform credentials")
-            return None
-            
-        platform_credentials = response.json()
-        telegram_credentials = next((p for p in platform_credentials if p.get("platform") == "telegram"), None)
-        
-        if telegram_credentials:
-            logger.info("Found existing Telegram credentials")
-        else:
-            logger.info("No Telegram credentials found")
-            
-        return telegram_credentials
-    except Exception as e:
-        logger.warning(f"Error getting platform credentials: {e}")
-        return None
+    return create_bot_instance(account_id, name)
 
-def create_telegram_credentials(bot_id, token):
-    """Create Telegram credentials for the bot - handle API errors gracefully"""
+def ensure_telegram_credentials(bot_id, token):
+    """Create or update Telegram credentials for the bot - handle API errors gracefully
+    
+    The platforms endpoint updates the bot's existing credentials for the platform,
+    so a single POST covers both the first run and re-runs.
+    """
     try:
-        url = urljoin(BASE_URL, f"/v1/api/bots/{bot_id}/platforms")
+        url = BOT_PLATFORMS_URL_TPL.format(bot_id=bot_id)
         cred_data = {
             "platform": "telegram",
             "credentials": {
@@ -406,23 +381,30 @@ def create_telegram_credentials(bot_id, token):
         
         response = session.post(url, json=cred_data, timeout=5)
         
-        if not check_response(response, "create_telegram_credentials"):
-            logger.warning("Failed to create Telegram credentials")
+        if not check_response(response, "ensure_telegram_credentials"):
+            logger.warning("Failed to save Telegram credentials")
             return {"id": "placeholder-platform-id"}
             
-        logger.info("Successfully created Telegram credentials")
+        logger.info("Successfully saved Telegram credentials")
         return response.json()
     except Exception as e:
-        logger.warning(f"Error creating Telegram credentials: {e}")
+        logger.warning(f"Error saving Telegram credentials: {e}")
         return {"id": "placeholder-platform-id"}
 
+@functools.lru_cache(maxsize=1)
+def _cached_ngrok_url():
+    """Look up the ngrok https tunnel once per run; raises when there is none so a miss is not cached"""
+    ngrok_info = session.get(NGROK_TUNNELS_URL, timeout=5).json()
+    for tunnel in ngrok_info.get("tunnels", []):
+        if tunnel.get("proto") == "https":
+            return tunnel.get("public_url")
+    
+    raise APIError("No https tunnel found")
+
 def get_ngrok_url():
     """Get the current ngrok tunnel URL"""
     try:
-        ngrok_info = json.loads(requests.get("http://localhost:4040/api/tunnels", timeout=5).text)
-        for tunnel in ngrok_info.get("tunnels", []):
-            if tunnel.get("proto") == "https":
-                return tunnel.get("public_url")
+        return _cached_ngrok_url()
     except Exception as e:
         logger.warning(f"Failed to get ngrok URL: {e}")
     
@@ -442,17 +424,19 @@ def set_telegram_webhook_direct(bot_token, webhook_url):
     current_retry = 0
     
     while current_retry < max_retries:
-        telegram_response = requests.post(telegram_url, json=telegram_data, timeout=10)
+        telegram_response = telegram_session.post(telegram_url, json=telegram_data, timeout=10)
         
         # Check if successful
-        if telegram_response.status_code == 200 and telegram_response.json().get("ok"):
-            logger.info("Successfully set webhook via direct Telegram API call")
-            return {
-                "webhook_url": webhook_url,
-                "status": "success",
-                "message": "Set via direct Telegram API",
-                "telegram_response": telegram_response.json()
-            }
+        if telegram_response.status_code == 200:
+            telegram_result = telegram_response.json()
+            if telegram_result.get("ok"):
+                logger.info("Successfully set webhook via direct Telegram API call")
+                return {
+                    "webhook_url": webhook_url,
+                    "status": "success",
+                    "message": "Set via direct Telegram API",
+                    "telegram_response": telegram_result
+                }
         
         # Check for rate limiting
         if telegram_response.status_code == 429:
@@ -465,7 +449,7 @@ def set_telegram_webhook_direct(bot_token, webhook_url):
                 pass
             
             logger.warning(f"Rate limited by Telegram API. Waiting {retry_after} seconds before retry {current_retry + 1}/{max_retries}")
-            time.sleep(retry_after + 0.5)  # Add a small buffer
+            time.sleep(retry_after + random.uniform(0.1, 0.5))  # Add a small jittered buffer
             current_retry += 1
             continue
         
@@ -479,23 +463,35 @@ def set_telegram_webhook_direct(bot_token, webhook_url):
         "message": "Failed to set webhook via direct Telegram API after retries"
     }
 
-def set_ngrok_webhook(bot_id, platform_id, token):
-    """Set ngrok webhook for the bot - handle API errors gracefully with fallback to direct Telegram API"""
+def set_webhook_via_telegram(token, webhook_url):
+    """Set the webhook directly with Telegram, forgetting the ngrok URL if that fails"""
+    logger.info(f"Setting direct Telegram webhook to: {webhook_url}")
+    result = set_telegram_webhook_direct(token, webhook_url)
+    if result["status"] == "error":
+        # The tunnel may have been restarted under a new URL; look it up again next time
+        _cached_ngrok_url.cache_clear()
+    return result
+
+def set_ngrok_webhook(bot_id, platform_id, token, ngrok_url):
+    """Set ngrok webhook for the bot - handle API errors gracefully with fallback to direct Telegram API
+    
+    WEBHOOK_MODE selects the path: "api" only uses the API server, "direct" only calls
+    Telegram, and "auto" tries the API server first and falls back to Telegram.
+    """
+    global _webhook_api_unavailable
     try:
-        # Get ngrok URL for the webhook
-        ngrok_url = get_ngrok_url()
         if not ngrok_url:
             logger.error("Failed to get webhook URL from ngrok")
             return {"webhook_url": "Error: No ngrok URL", "status": "error"}
         
         webhook_url = f"{ngrok_url}/v1/api/webhooks/telegram/{bot_id}"
-        # Keep the simplified URL for reference, but we won't use it
-        simple_webhook_url = f"{ngrok_url}/telegram"  # Simplified URL for direct Telegram API
-        
         logger.info(f"Setting webhook URL to: {webhook_url}")
         
+        if WEBHOOK_MODE == "direct" or (WEBHOOK_MODE == "auto" and _webhook_api_unavailable):
+            return set_webhook_via_telegram(token, webhook_url)
+        
         # Try to set webhook using the API server endpoint
-        url = urljoin(BASE_URL, f"/v1/api/webhooks/telegram/{bot_id}/set")
+        url = TELEGRAM_WEBHOOK_SET_URL_TPL.format(bot_id=bot_id)
         webhook_data = {
             "url": webhook_url,
             "drop_pending_updates": True
@@ -504,18 +500,20 @@ def set_ngrok_webhook(bot_id, platform_id, token):
         response = session.post(url, json=webhook_data, timeout=10)
         api_server_success = response.status_code in [200, 201]
         
-        # If API server call failed, try direct Telegram API call
         if not api_server_success:
-            logger.info("API server webhook setup failed. Trying direct Telegram API call...")
-            # Use the full API path instead of simplified one
-            full_webhook_url = f"{ngrok_url}/v1/api/webhooks/telegram/{bot_id}"
-            logger.info(f"Setting direct Telegram webhook to: {full_webhook_url}")
+            if WEBHOOK_MODE == "api":
+                logger.error(f"API server webhook setup failed: {response.status_code} - {response.text}")
+                return {"webhook_url": webhook_url, "status": "error"}
             
-            return set_telegram_webhook_direct(token, full_webhook_url)
+            # If API server call failed, try direct Telegram API call, and go there first from now on
+            _webhook_api_unavailable = True
+            logger.info("API server webhook setup failed. Trying direct Telegram API call...")
+            return set_webhook_via_telegram(token, webhook_url)
             
         # If API server was successful
         logger.info("Successfully set ngrok webhook via API server")
-        result = response.json() if response.text and response.text != "null" else {}
+        # An empty or null body means there is nothing to merge into the result
+        result = (response.json() if response.content else None) or {}
         result["webhook_url"] = webhook_url
         result["status"] = "success"
         return result
@@ -536,7 +534,7 @@ def check_and_set_bot_scenario(bot_id, force_reload=False):
     """
     try:
         # Check if the bot has an active scenario
-        url = urljoin(BASE_URL, f"/v1/api/bots/{bot_id}/scenarios")
+        url = BOT_SCENARIOS_URL_TPL.format(bot_id=bot_id)
         logger.info(f"Checking if bot {bot_id} has an active scenario")
         
         response = session.get(url, params={"active_only": True}, timeout=5)
@@ -552,18 +550,9 @@ def check_and_set_bot_scenario(bot_id, force_reload=False):
             return True
         
         if scenarios and len(scenarios) > 0 and force_reload:
-            # Deactivate existing scenarios before creating a new one
-            logger.info("Deactivating existing scenarios before reload")
-            for scenario in scenarios:
-                scenario_id = scenario.get("id")
-                deactivate_url = urljoin(BASE_URL, f"/v1/api/bots/{bot_id}/scenarios/{scenario_id}")
-                deactivate_data = {"is_active": False}
-                deactivate_response = session.patch(deactivate_url, json=deactivate_data, timeout=5)
-                
-                if not check_response(deactivate_response, "deactivate_scenario"):
-                    logger.warning(f"Failed to deactivate scenario {scenario_id}")
-            
-            logger.info("Existing scenarios deactivated. Loading updated scenario.")
+            # The upload creates the scenario as active, which deactivates the bot's
+            # existing scenarios in the same transaction - no per-scenario requests needed
+            logger.info(f"Replacing {len(scenarios)} active scenario(s) with the updated scenario")
             
         # Read the onboarding scenario file
         scenario_path = ROOT_DIR / "docs" / "modules" / "bot-management" / "example-scenario" / "onboarding_scenario.json"
@@ -573,14 +562,14 @@ def check_and_set_bot_scenario(bot_id, force_reload=False):
             return False
             
         try:
-            with open(scenario_path, "r", encoding="utf-8") as f:
-                scenario_data = json.load(f)
+            # The endpoint takes the file's JSON text as-is and validates it, so it is not parsed here
+            scenario_content = _load_text(str(scenario_path), scenario_path.stat().st_mtime_ns)
                 
             # Create a new scenario for the bot
-            scenario_url = urljoin(BASE_URL, f"/v1/api/bots/{bot_id}/scenarios/upload")
+            scenario_url = BOT_SCENARIO_UPLOAD_URL_TPL.format(bot_id=bot_id)
             
             scenario_payload = {
-                "file_content": json.dumps(scenario_data)
+                "file_content": scenario_content
             }
             
             scenario_response = session.post(scenario_url, json=scenario_payload, timeout=10)
@@ -593,9 +582,6 @@ def check_and_set_bot_scenario(bot_id, force_reload=False):
             logger.info(f"Successfully created default scenario with ID: {scenario_result.get('id')}")
             return True
             
-        except json.JSONDecodeError as je:
-            logger.error(f"Error parsing scenario file: {je}")
-            return False
         except Exception as e:
             logger.error(f"Error setting default scenario: {e}")
             return False
@@ -618,30 +604,25 @@ def main():
         account = get_account_by_name()
         account_id = account["id"]
         
-        # Get bot instance for this account
-        bot_instance = get_bot_instance(account_id)
-        
-        # If no bot instance exists, create one
-        if not bot_instance:
-            bot_instance = create_bot_instance(account_id)
-            
+        # Get or create the bot instance for this account
+        bot_instance = ensure_bot_instance(account_id)
         bot_id = bot_instance["id"]
         
-        # Check platform credentials for bot instance
-        telegram_credentials = get_platform_credentials(bot_id)
-        
-        # If platform credentials don't exist, create them
-        if not telegram_credentials:
-            telegram_credentials = create_telegram_credentials(bot_id, telegram_token)
-            platform_id = telegram_credentials["id"]
-        else:
-            platform_id = telegram_credentials["id"]
+        # Credentials, scenario setup and ngrok discovery don't depend on each other
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            credentials_future = executor.submit(ensure_telegram_credentials, bot_id, telegram_token)
+            # Check if bot has a scenario and set default if not, force reload the scenario to apply changes
+            scenario_future = executor.submit(check_and_set_bot_scenario, bot_id, True)
+            ngrok_future = executor.submit(get_ngrok_url)
+            
+            telegram_credentials = credentials_future.result()
+            scenario_status = scenario_future.result()
+            ngrok_url = ngrok_future.result()
         
-        # Check if bot has a scenario and set default if not, force reload the scenario to apply changes
-        scenario_status = check_and_set_bot_scenario(bot_id, force_reload=True)
+        platform_id = telegram_credentials["id"]
         
         # Set ngrok webhook for bot
-        webhook_info = set_ngrok_webhook(bot_id, platform_id, telegram_token)
+        webhook_info = set_ngrok_webhook(bot_id, platform_id, telegram_token, ngrok_url)
         
         logger.info("\n=== SUMMARY ===")
         logger.info(f"Account ID: {account_id}")
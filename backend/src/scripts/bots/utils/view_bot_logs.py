@@ -33,15 +33,25 @@ import sys
 import json
 import argparse
 import glob
+import heapq
+import itertools
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional, Union, Callable
+from typing import Dict, Any, List, Optional, Union, Callable, Iterable, Iterator, Tuple
 from uuid import UUID
 import re
 import colorama
 from colorama import Fore, Style
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from operator import attrgetter
 from enum import Enum
 
+# orjson parses log lines several times faster; fall back to the stdlib parser
+try:
+    import orjson as _json
+except ImportError:
+    _json = json
+
 # Add project root to path to ensure imports work correctly
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../..")))
 
@@ -66,7 +76,29 @@ except ImportError:
         CACHE = "CACHE"           # Cache operations
 
 
-@dataclass
+# Level and event types given to entries that don't carry their own
+DEFAULT_LEVEL = "INFO"
+DEFAULT_EVENT_TYPE = "UNKNOWN"
+TEXT_EVENT_TYPE = "TEXT"  # non-JSON lines
+
+# Fields lifted into LogEntry.context, in display order
+CONTEXT_KEYS = ("bot_id", "platform", "platform_chat_id", "dialog_id", "user_id")
+
+# Fields kept out of LogEntry.data because they have their own place in the entry
+NON_DATA_KEYS = frozenset(CONTEXT_KEYS) | frozenset(("timestamp", "level", "event_type", "message", "logger"))
+
+
+# Log timestamps are naive datetimes, so integer timestamps count from a naive epoch
+EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def to_epoch_us(timestamp: datetime) -> int:
+    """Convert a naive datetime to integer microseconds since the epoch"""
+    return (timestamp - EPOCH) // _MICROSECOND
+
+
+@dataclass(slots=True)
 class LogEntry:
     """Class for representing a single log entry with standardized fields"""
     timestamp: datetime
@@ -75,40 +107,50 @@ class LogEntry:
     message: str
     context: Dict[str, Any]
     data: Dict[str, Any]
-    raw: str  # Original raw log entry
+    raw: bytes  # Original raw log entry, decoded only when needed
+    ts_us: int = field(init=False, repr=False)  # timestamp as epoch microseconds, for sorting and date filters
+    _raw_lower: Optional[str] = field(default=None, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self.ts_us = to_epoch_us(self.timestamp)
+    
+    @property
+    def raw_lower(self) -> str:
+        """Decoded, lowercased raw entry for case-insensitive searches, computed on first use"""
+        if self._raw_lower is None:
+            self._raw_lower = self.raw.decode("utf-8", errors="replace").lower()
+        return self._raw_lower
     
     @classmethod
-    def from_json(cls, json_str: str) -> "LogEntry":
-        """Create a LogEntry from a JSON string"""
+    def from_json(cls, json_str: bytes) -> "LogEntry":
+        """Create a LogEntry from a JSON line"""
         try:
-            data = json.loads(json_str)
+            data = _json.loads(json_str)
             # Extract standardized fields
             timestamp_str = data.get("timestamp", "")
             timestamp = parse_timestamp(timestamp_str) if timestamp_str else datetime.now()
-            level = data.get("level", "INFO")
+            # Level and event type are uppercased once here so filters and colors can match them directly
+            level = data.get("level", DEFAULT_LEVEL)
+            if isinstance(level, str):
+                level = level.upper()
             
             # Extract event type
-            event_type = data.get("event_type", "UNKNOWN")
+            event_type = data.get("event_type", DEFAULT_EVENT_TYPE)
+            if isinstance(event_type, str):
+                event_type = event_type.upper()
             
             # Extract message
             message = data.get("message", "")
             
-            # Extract context - bot_id, platform, etc.
-            context = {
-                "bot_id": data.get("bot_id"),
-                "platform": data.get("platform"),
-                "platform_chat_id": data.get("platform_chat_id"),
-                "dialog_id": data.get("dialog_id"),
-                "user_id": data.get("user_id")
-            }
-            # Remove None values
-            context = {k: v for k, v in context.items() if v is not None}
+            # Extract context - bot_id, platform, etc. - skipping None values
+            context = {}
+            for key in CONTEXT_KEYS:
+                value = data.get(key)
+                if value is not None:
+                    context[key] = value
             
             # All other fields go into data
-            data_fields = {k: v for k, v in data.items() if k not in [
-                "timestamp", "level", "event_type", "message", 
-                "bot_id", "platform", "platform_chat_id", "dialog_id", "user_id", "logger"
-            ]}
+            data_fields = {k: v for k, v in data.items() if k not in NON_DATA_KEYS}
             
             return cls(
                 timestamp=timestamp,
@@ -119,31 +161,48 @@ class LogEntry:
                 data=data_fields,
                 raw=json_str
             )
-        except json.JSONDecodeError:
+        except ValueError:
             # Handle non-JSON lines as plain text
             return cls(
                 timestamp=datetime.now(),
-                level="INFO",
-                event_type="TEXT",
-                message=json_str.strip(),
+                level=DEFAULT_LEVEL,
+                event_type=TEXT_EVENT_TYPE,
+                message=json_str.decode("utf-8", errors="replace").strip(),
                 context={},
                 data={},
                 raw=json_str
             )
 
 
+TIMESTAMP_FORMATS = [
+    "%Y-%m-%dT%H:%M:%S.%fZ",  # ISO format with milliseconds
+    "%Y-%m-%dT%H:%M:%SZ",      # ISO format without milliseconds
+    "%Y-%m-%d %H:%M:%S.%f",    # Standard format with milliseconds
+    "%Y-%m-%d %H:%M:%S",       # Standard format without milliseconds
+]
+
+# Format that parsed the previous timestamp; log files rarely mix formats
+_last_timestamp_format = TIMESTAMP_FORMATS[0]
+
+
 def parse_timestamp(timestamp_str: str) -> datetime:
     """Parse timestamp string into datetime object, handling various formats"""
-    formats = [
-        "%Y-%m-%dT%H:%M:%S.%fZ",  # ISO format with milliseconds
-        "%Y-%m-%dT%H:%M:%SZ",      # ISO format without milliseconds
-        "%Y-%m-%d %H:%M:%S.%f",    # Standard format with milliseconds
-        "%Y-%m-%d %H:%M:%S",       # Standard format without milliseconds
-    ]
-    
-    for fmt in formats:
+    global _last_timestamp_format
+    
+    # The C-implemented ISO parser covers the usual formats; a trailing Z is dropped
+    # so the result stays naive like the strptime formats below
+    try:
+        timestamp = datetime.fromisoformat(timestamp_str[:-1] if timestamp_str.endswith("Z") else timestamp_str)
+        if timestamp.tzinfo is None:
+            return timestamp
+    except ValueError:
+        pass
+    
+    for fmt in (_last_timestamp_format, *TIMESTAMP_FORMATS):
         try:
-            return datetime.strptime(timestamp_str, fmt)
+            timestamp = datetime.strptime(timestamp_str, fmt)
+            _last_timestamp_format = fmt
+            return timestamp
         except ValueError:
             continue
     
@@ -151,124 +210,214 @@ def parse_timestamp(timestamp_str: str) -> datetime:
     return datetime.now()
 
 
-def read_logs_from_file(file_path: str) -> List[LogEntry]:
-    """Read logs from file and parse into LogEntry objects"""
-    log_entries = []
-    
+# Log files are read from disk in chunks of this many bytes
+BUFFER_SIZE = 1 << 16
+
+
+@dataclass
+class ReadStats:
+    """Running count of log lines read, including lines dropped before parsing"""
+    lines: int = 0
+
+
+def build_line_needles(
+    bot_id: Optional[str] = None,
+    platform: Optional[str] = None,
+    chat_id: Optional[str] = None,
+    dialog_id: Optional[str] = None,
+    contains: Optional[str] = None,
+    level: Optional[str] = None,
+    event_type: Optional[str] = None,
+) -> Tuple[bytes, ...]:
+    """Lowercased substrings that every raw line matching the filters must contain
+    
+    Lines missing one of them are skipped before JSON parsing. Only values that read
+    the same inside a JSON string qualify (printable ASCII without quotes or
+    backslashes); filter_logs still applies the exact filters to what passes.
+    A level or event type that entries get by default is no needle, since lines
+    without the field (or plain-text lines) match it without containing it.
+    """
+    if level and level.upper() == DEFAULT_LEVEL:
+        level = None
+    if event_type and event_type.upper() in (DEFAULT_EVENT_TYPE, TEXT_EVENT_TYPE):
+        event_type = None
+    
+    needles = []
+    for value in (bot_id, platform, chat_id, dialog_id, contains, level, event_type):
+        if value:
+            value = str(value).lower()
+            if value.isascii() and value.isprintable() and '"' not in value and '\\' not in value:
+                needles.append(value.encode("ascii"))
+    return tuple(needles)
+
+
+def read_logs_from_file(
+    file_path: str,
+    needles: Tuple[bytes, ...] = (),
+    stats: Optional[ReadStats] = None,
+) -> Iterator[LogEntry]:
+    """Read logs from file and parse into LogEntry objects, skipping lines without all needles"""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
+        with open(file_path, 'rb', buffering=BUFFER_SIZE) as f:
             for line in f:
                 line = line.strip()
                 if not line:
                     continue
+                
+                if stats is not None:
+                    stats.lines += 1
+                    
+                if needles:
+                    lowered = line.lower()
+                    if not all(needle in lowered for needle in needles):
+                        continue
                     
-                log_entries.append(LogEntry.from_json(line))
+                yield LogEntry.from_json(line)
                 
     except FileNotFoundError:
         print(f"Error: Log file {file_path} not found.")
     except Exception as e:
         print(f"Error reading log file: {str(e)}")
-        
-    return log_entries
 
 
-def read_logs_from_directory(directory_path: str) -> List[LogEntry]:
-    """Read logs from all log files in a directory"""
-    log_entries = []
-    log_files = glob.glob(os.path.join(directory_path, "bot_conversations_*.log"))
+# Sort key for entries; timestamps compare as integers
+by_timestamp = attrgetter("ts_us")
+
+
+def load_log_file(
+    file_path: str,
+    needles: Tuple[bytes, ...] = (),
+    filters: Optional[Dict[str, Any]] = None,
+) -> Tuple[List[LogEntry], int]:
+    """Read one log file, returning its entries that match filters sorted by timestamp and its line count
+    
+    Runs in worker processes too, so only the matches are sent back to the parent.
+    Appended files are nearly in order already, which keeps the sort cheap.
+    """
+    stats = ReadStats()
+    entries = filter_logs(read_logs_from_file(file_path, needles, stats), **(filters or {}))
+    entries.sort(key=by_timestamp)
+    return entries, stats.lines
+
+
+def read_logs_from_directory(
+    directory_path: str,
+    needles: Tuple[bytes, ...] = (),
+    stats: Optional[ReadStats] = None,
+    filters: Optional[Dict[str, Any]] = None,
+) -> Iterator[List[LogEntry]]:
+    """Read logs from all log files in a directory as one sorted list of matches per file, parsing the files in parallel"""
+    log_files = sorted(glob.glob(os.path.join(directory_path, "bot_conversations_*.log")))
+    
+    # A process pool only pays off with several files and several cores to spread them over
+    workers = min(len(log_files), os.cpu_count() or 1)
+    if workers < 2:
+        results = (load_log_file(file_path, needles, filters) for file_path in log_files)
+        executor = None
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        results = executor.map(load_log_file, log_files, itertools.repeat(needles), itertools.repeat(filters))
     
-    for file_path in sorted(log_files):
-        log_entries.extend(read_logs_from_file(file_path))
-        
-    return log_entries
+    try:
+        for entries, lines in results:
+            if stats is not None:
+                stats.lines += lines
+            yield entries
+    finally:
+        if executor is not None:
+            executor.shutdown()
 
 
 def filter_logs(
-    logs: List[LogEntry],
+    logs: Iterable[LogEntry],
     bot_id: Optional[str] = None,
     platform: Optional[str] = None,
     chat_id: Optional[str] = None,
     dialog_id: Optional[str] = None,
-    level: Optional[str] = None,
+    level: Optional[Union[str, Iterable[str]]] = None,
     event_type: Optional[str] = None,
     from_date: Optional[datetime] = None,
     to_date: Optional[datetime] = None,
     contains: Optional[str] = None,
 ) -> List[LogEntry]:
-    """Filter logs based on criteria"""
-    filtered_logs = []
-    
-    for log in logs:
-        # Skip if bot_id doesn't match
-        if bot_id and str(log.context.get("bot_id", "")).lower() != str(bot_id).lower():
-            continue
-        
-        # Skip if platform doesn't match
-        if platform and log.context.get("platform", "").lower() != platform.lower():
-            continue
-        
-        # Skip if chat_id doesn't match
-        if chat_id and str(log.context.get("platform_chat_id", "")) != str(chat_id):
-            continue
-        
-        # Skip if dialog_id doesn't match
-        if dialog_id and str(log.context.get("dialog_id", "")).lower() != str(dialog_id).lower():
-            continue
-        
-        # Skip if level doesn't match
-        if level and log.level.upper() != level.upper():
-            continue
-        
-        # Skip if event_type doesn't match
-        if event_type and log.event_type.upper() != event_type.upper():
-            continue
-        
-        # Skip if timestamp is before from_date
-        if from_date and log.timestamp < from_date:
-            continue
-        
-        # Skip if timestamp is after to_date
-        if to_date and log.timestamp > to_date:
-            continue
-        
-        # Skip if doesn't contain the specified string (case-insensitive)
-        if contains and contains.lower() not in log.raw.lower() and contains.lower() not in log.message.lower():
-            continue
-        
-        filtered_logs.append(log)
-    
-    return filtered_logs
+    """Filter logs based on criteria; level may be one level or several"""
+    # Normalize each filter once and keep a predicate only for the filters that are set.
+    # They are ordered most selective first (a single dialog, chat or bot) and most
+    # expensive last, so all() drops most entries after one or two checks
+    predicates: List[Callable[[LogEntry], bool]] = []
+    
+    if dialog_id:
+        dialog_id = str(dialog_id).lower()
+        predicates.append(lambda log: str(log.context.get("dialog_id", "")).lower() == dialog_id)
+    
+    if chat_id:
+        chat_id = str(chat_id)
+        predicates.append(lambda log: str(log.context.get("platform_chat_id", "")) == chat_id)
+    
+    if bot_id:
+        bot_id = str(bot_id).lower()
+        predicates.append(lambda log: str(log.context.get("bot_id", "")).lower() == bot_id)
+    
+    # Entries hold uppercased level and event type, see LogEntry.from_json
+    if event_type:
+        event_type = event_type.upper()
+        predicates.append(lambda log: log.event_type == event_type)
+    
+    if level:
+        levels = frozenset(item.upper() for item in ([level] if isinstance(level, str) else level))
+        predicates.append(lambda log: log.level in levels)
+    
+    if platform:
+        platform = platform.lower()
+        predicates.append(lambda log: log.context.get("platform", "").lower() == platform)
+    
+    # Date bounds are compared as integers
+    if from_date:
+        from_us = to_epoch_us(from_date)
+        predicates.append(lambda log: log.ts_us >= from_us)
+    
+    if to_date:
+        to_us = to_epoch_us(to_date)
+        predicates.append(lambda log: log.ts_us <= to_us)
+    
+    # Case-insensitive match against the raw entry or its message
+    if contains:
+        contains = contains.lower()
+        predicates.append(lambda log: contains in log.raw_lower or contains in log.message.lower())
+    
+    return [log for log in logs if all(predicate(log) for predicate in predicates)]
+
+
+# Color mapping for log levels
+LEVEL_COLORS = {
+    "DEBUG": Fore.CYAN,
+    "INFO": Fore.GREEN,
+    "WARNING": Fore.YELLOW,
+    "ERROR": Fore.RED,
+    "CRITICAL": Fore.RED + Style.BRIGHT,
+}
+
+# Color mapping for event types
+EVENT_COLORS = {
+    "INCOMING": Fore.BLUE,
+    "OUTGOING": Fore.MAGENTA,
+    "ERROR": Fore.RED,
+    "STATE_CHANGE": Fore.YELLOW,
+    "PROCESSING": Fore.CYAN,
+}
+
+# Timestamp display format; the last three digits of %f are cut to show milliseconds
+DISPLAY_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
 
 
 def format_log_entry_text(log: LogEntry, show_context: bool = True) -> str:
     """Format a log entry as colorized text"""
-    # Initialize colorama
-    colorama.init()
-    
-    # Color mapping for log levels
-    level_colors = {
-        "DEBUG": Fore.CYAN,
-        "INFO": Fore.GREEN,
-        "WARNING": Fore.YELLOW,
-        "ERROR": Fore.RED,
-        "CRITICAL": Fore.RED + Style.BRIGHT,
-    }
-    
-    # Color mapping for event types
-    event_colors = {
-        "INCOMING": Fore.BLUE,
-        "OUTGOING": Fore.MAGENTA,
-        "ERROR": Fore.RED,
-        "STATE_CHANGE": Fore.YELLOW,
-        "PROCESSING": Fore.CYAN,
-    }
-    
     # Get colors
-    level_color = level_colors.get(log.level, Fore.WHITE)
-    event_color = event_colors.get(log.event_type, Fore.WHITE)
+    level_color = LEVEL_COLORS.get(log.level, Fore.WHITE)
+    event_color = EVENT_COLORS.get(log.event_type, Fore.WHITE)
     
     # Format timestamp
-    timestamp = log.timestamp.strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+    timestamp = log.timestamp.strftime(DISPLAY_TIMESTAMP_FORMAT)[:-3]
     
     # Format context string if requested
     context_str = ""
@@ -299,7 +448,7 @@ def format_log_entry_text(log: LogEntry, show_context: bool = True) -> str:
     
     # Combine main line with data lines if any
     if data_lines:
-        return main_line + "\n" + "\n".join(data_lines)
+        return "\n".join([main_line, *data_lines])
     else:
         return main_line
 
@@ -307,7 +456,7 @@ def format_log_entry_text(log: LogEntry, show_context: bool = True) -> str:
 def format_logs(logs: List[LogEntry], raw: bool = False, show_context: bool = True) -> List[str]:
     """Format logs as either raw JSON or human-readable text"""
     if raw:
-        return [log.raw for log in logs]
+        return [log.raw.decode("utf-8", errors="replace") for log in logs]
     else:
         return [format_log_entry_text(log, show_context) for log in logs]
 
@@ -327,24 +476,26 @@ def find_latest_log_file(directory_path: str = None) -> Optional[str]:
     return log_files[0]
 
 
+# Accepted formats for --from-date/--to-date
+DATE_FORMATS = (
+    "%Y-%m-%d",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d %H:%M",
+    "%Y/%m/%d",
+    "%d-%m-%Y",
+    "%d/%m/%Y",
+)
+
+
 def parse_date(date_str: str) -> datetime:
-    """Parse date string into datetime object"""
-    formats = [
-        "%Y-%m-%d",
-        "%Y-%m-%d %H:%M:%S",
-        "%Y-%m-%d %H:%M",
-        "%Y/%m/%d",
-        "%d-%m-%Y",
-        "%d/%m/%Y",
-    ]
-    
-    for fmt in formats:
+    """Parse date string into datetime object; used as an argparse type"""
+    for fmt in DATE_FORMATS:
         try:
             return datetime.strptime(date_str, fmt)
         except ValueError:
             continue
             
-    raise ValueError(f"Could not parse date: {date_str}. Use format YYYY-MM-DD.")
+    raise argparse.ArgumentTypeError(f"Could not parse date: {date_str}. Use format YYYY-MM-DD.")
 
 
 def main():
@@ -364,11 +515,11 @@ def main():
     filter_group.add_argument("--platform", type=str, help="Filter by platform (e.g., telegram)")
     filter_group.add_argument("--chat-id", type=str, help="Filter by platform chat ID")
     filter_group.add_argument("--dialog-id", type=str, help="Filter by dialog ID")
-    filter_group.add_argument("--level", choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"],
-                       help="Filter by log level")
+    filter_group.add_argument("--level", nargs="+", choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"],
+                       help="Filter by log level (one or more)")
     filter_group.add_argument("--event-type", type=str, help="Filter by event type")
-    filter_group.add_argument("--from-date", type=str, help="Filter from date (YYYY-MM-DD)")
-    filter_group.add_argument("--to-date", type=str, help="Filter to date (YYYY-MM-DD)")
+    filter_group.add_argument("--from-date", type=parse_date, help="Filter from date (YYYY-MM-DD)")
+    filter_group.add_argument("--to-date", type=parse_date, help="Filter to date (YYYY-MM-DD)")
     filter_group.add_argument("--contains", type=str, help="Filter logs containing text")
     filter_group.add_argument("--tail", type=int, help="Show only the last N logs")
     
@@ -380,28 +531,36 @@ def main():
     
     args = parser.parse_args()
     
-    # Parse dates if provided
-    from_date = None
-    to_date = None
-    
-    if args.from_date:
-        try:
-            from_date = parse_date(args.from_date)
-        except ValueError as e:
-            print(f"Error: {str(e)}")
-            sys.exit(1)
+    # Initialize colorama once for all formatted lines
+    colorama.init()
     
-    if args.to_date:
-        try:
-            to_date = parse_date(args.to_date)
-            # Set time to end of day
-            to_date = to_date.replace(hour=23, minute=59, second=59, microsecond=999999)
-        except ValueError as e:
-            print(f"Error: {str(e)}")
-            sys.exit(1)
+    # Dates are parsed by argparse; the upper bound covers the whole day
+    from_date = args.from_date
+    to_date = args.to_date
+    if to_date:
+        to_date = to_date.replace(hour=23, minute=59, second=59, microsecond=999999)
+    
+    # Read logs from requested sources; lines that can't match are dropped before parsing
+    # Several levels can't share one needle, so only a single level narrows the raw lines
+    single_level = args.level[0] if args.level and len(args.level) == 1 else None
+    needles = build_line_needles(
+        args.bot_id, args.platform, args.chat_id, args.dialog_id, args.contains, single_level, args.event_type
+    )
+    filters = dict(
+        bot_id=args.bot_id,
+        platform=args.platform,
+        chat_id=args.chat_id,
+        dialog_id=args.dialog_id,
+        level=args.level,
+        event_type=args.event_type,
+        from_date=from_date,
+        to_date=to_date,
+        contains=args.contains,
+    )
+    stats = ReadStats()
     
-    # Collect logs from requested sources
-    all_logs = []
+    # Each file is filtered and sorted on its own; only its matches are kept
+    filtered_streams = []
     
     if args.source in ("file", "all"):
         log_file = args.file
@@ -413,34 +572,22 @@ def main():
                 print(f"Using latest log file: {log_file}")
                 
         if log_file:
-            all_logs.extend(read_logs_from_file(log_file))
+            entries, lines = load_log_file(log_file, needles, filters)
+            stats.lines += lines
+            filtered_streams.append(entries)
     
     if not args.file and args.source == "all":
         # Read from log directory if no specific file
         log_dir = args.dir or os.environ.get("BOT_LOG_DIR", "logs")
         if os.path.isdir(log_dir):
-            all_logs.extend(read_logs_from_directory(log_dir))
+            filtered_streams.extend(read_logs_from_directory(log_dir, needles, stats, filters))
     
-    if not all_logs:
+    if not stats.lines:
         print("No log entries found.")
         sys.exit(0)
     
-    # Sort logs by timestamp
-    all_logs.sort(key=lambda x: x.timestamp)
-    
-    # Apply filters
-    filtered_logs = filter_logs(
-        all_logs,
-        bot_id=args.bot_id,
-        platform=args.platform,
-        chat_id=args.chat_id,
-        dialog_id=args.dialog_id,
-        level=args.level,
-        event_type=args.event_type,
-        from_date=from_date,
-        to_date=to_date,
-        contains=args.contains,
-    )
+    # Merge the sorted per-file matches by timestamp
+    filtered_logs = list(heapq.merge(*filtered_streams, key=by_timestamp))
     
     # Apply tail if requested
     if args.tail and len(filtered_logs) > args.tail:
@@ -453,17 +600,16 @@ def main():
     if args.output:
         try:
             with open(args.output, 'w', encoding='utf-8') as f:
-                for log in formatted_logs:
-                    f.write(log + "\n")
+                f.writelines(f"{log}\n" for log in formatted_logs)
             print(f"Logs written to {args.output}")
         except Exception as e:
             print(f"Error writing to output file: {str(e)}")
-    else:
-        for log in formatted_logs:
-            print(log)
+    elif formatted_logs:
+        # One write for the whole batch instead of a flush per line
+        sys.stdout.write("\n".join(formatted_logs) + "\n")
     
     # Summary
-    print(f"\n{len(filtered_logs)} log entries displayed out of {len(all_logs)} total entries.")
+    print(f"\n{len(filtered_logs)} log entries displayed out of {stats.lines} total entries.")
 
 
 if __name__ == "__main__":
@@ -1,4 +1,6 @@
 from celery import Celery
+from celery.signals import worker_process_init
+import asyncio
 import os
 from dotenv import load_dotenv
 
@@ -32,10 +34,35 @@ celery_app.conf.update(
 # Setup Celery beat schedule for periodic tasks
 celery_app.conf.beat_schedule = {
     'check-telegram-webhooks': {
-        'task': 'src.worker.tasks.bots.webhook_tasks.check_telegram_webhooks',
+        'task': 'check_telegram_webhooks',
         'schedule': 300.0,  # 5 minutes
     },
 }
 
+# Event loop shared by all async work in this worker process
+_loop = None
+
+
+@worker_process_init.connect
+def init_worker_loop(**kwargs):
+    """Create the worker process's event loop once, right after the fork."""
+    global _loop
+    _loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(_loop)
+
+
+def run_async(coro):
+    """
+    Run a coroutine to completion on the worker process's event loop.
+    
+    The loop is created lazily when the worker_process_init signal did not fire
+    (e.g. the solo pool or a direct call), and is reused by later tasks.
+    """
+    global _loop
+    if _loop is None or _loop.is_closed():
+        init_worker_loop()
+    return _loop.run_until_complete(coro)
+
+
 if __name__ == "__main__":
     celery_app.start()
\ No newline at end of file
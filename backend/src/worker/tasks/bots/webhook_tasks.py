@@ -1,42 +1,65 @@
 """
 Background tasks for managing Telegram webhook health.
 """
+import asyncio
 import logging
 from datetime import datetime, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import or_
 from sqlalchemy.future import select
+from telegram.request import HTTPXRequest
 
 from src.api.models import BotPlatformCredential
 from src.api.services.bots.webhook_service import WebhookService
-from src.worker.celery_app import shared_task
-from src.api.db.session import AsyncSessionLocal
+from src.worker.celery_app import celery_app, run_async
+from src.api.dependencies.async_db import AsyncSessionLocal
 
 logger = logging.getLogger(__name__)
 
 
-@shared_task(name="check_telegram_webhooks")
-async def check_telegram_webhooks():
+# Upper bound on bots checked against the Telegram API at the same time
+_WEBHOOK_CHECK_CONCURRENCY = 10
+
+
+@celery_app.task(name="check_telegram_webhooks")
+def check_telegram_webhooks():
     """Check and refresh Telegram webhooks if needed."""
+    # Celery tasks are sync, so drive the coroutine on the worker process's event loop
+    return run_async(_check_telegram_webhooks())
+
+
+async def _check_telegram_webhooks():
+    """Check every due Telegram webhook and refresh the ones that need it."""
+    # Skip bots checked recently (less than 4 minutes ago)
+    cutoff = datetime.utcnow() - timedelta(minutes=4)
+    
     async with AsyncSessionLocal() as db:
-        # Get all active Telegram bot credentials
+        # Get active Telegram bot credentials that are due for a check
         query = select(BotPlatformCredential).where(
             BotPlatformCredential.platform == "telegram",
             BotPlatformCredential.is_active == True,
-            BotPlatformCredential.webhook_auto_refresh == True
+            BotPlatformCredential.webhook_auto_refresh == True,
+            or_(
+                BotPlatformCredential.webhook_last_checked.is_(None),
+                BotPlatformCredential.webhook_last_checked < cutoff
+            )
         )
         
         result = await db.execute(query)
         credentials = result.scalars().all()
-        
-        webhook_service = WebhookService(db)
-        
-        for cred in credentials:
-            try:
-                # Skip if checked recently (less than 4 minutes ago)
-                if (cred.webhook_last_checked and 
-                    datetime.utcnow() - cred.webhook_last_checked < timedelta(minutes=4)):
-                    continue
-                    
+    
+    semaphore = asyncio.Semaphore(_WEBHOOK_CHECK_CONCURRENCY)
+    
+    # One connection pool to api.telegram.org for the whole run instead of one per bot
+    request = HTTPXRequest(connection_pool_size=_WEBHOOK_CHECK_CONCURRENCY)
+    await request.initialize()
+    
+    async def _check(cred):
+        try:
+            # An AsyncSession can't be shared by concurrent checks, so each bot gets its own
+            async with semaphore, AsyncSessionLocal() as db:
+                webhook_service = WebhookService(db, request=request)
+                
                 # Get webhook status
                 status = await webhook_service.get_status(cred.bot_id)
                 
@@ -52,6 +75,12 @@ async def check_telegram_webhooks():
                 if needs_refresh:
                     logger.info(f"Refreshing webhook for bot {cred.bot_id}")
                     await webhook_service.set_webhook(cred.bot_id)
-                
-            except Exception as e:
-                logger.error(f"Error checking webhook for bot {cred.bot_id}: {str(e)}")
\ No newline at end of file
+            
+        except Exception as e:
+            logger.error(f"Error checking webhook for bot {cred.bot_id}: {str(e)}")
+    
+    # Check all due bots concurrently so the run takes about one round trip, not one per bot
+    try:
+        await asyncio.gather(*(_check(cred) for cred in credentials), return_exceptions=True)
+    finally:
+        await request.shutdown()
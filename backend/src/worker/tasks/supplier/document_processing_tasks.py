@@ -1,6 +1,6 @@
 import logging
 from uuid import UUID
-from src.worker.celery_app import celery_app
+from src.worker.celery_app import celery_app, run_async
 from src.api.core.logging_config import get_logger
 from sqlalchemy.orm import Session
 from src.api.dependencies.db import get_db_session
@@ -8,7 +8,7 @@ from src.api.services.supplier.document_service import process_document as proce
 
 logger = get_logger("restaurant_api")
 
-@celery_app.task(bind=True)
+@celery_app.task(bind=True, ignore_result=False)
 def process_document(self, document_id: str):
     """
     Process uploaded document using Azure OpenAI.
@@ -23,19 +23,16 @@ def process_document(self, document_id: str):
         db = next(get_db_session())
         
         # Process document using Azure OpenAI
-        success = process_doc_service(db, UUID(document_id))
+        # The service is async, so run it on the worker process's shared event loop
+        success = run_async(process_doc_service(db, UUID(document_id)))
         
-        # Update task state
-        self.update_state(
-            state='SUCCESS' if success else 'FAILURE',
-            meta={
-                'document_id': document_id,
-                'status': 'processed' if success else 'error'
-            }
-        )
-        
-        logger.info(f"Document {document_id} processed successfully")
-        return {"status": "success", "document_id": document_id}
+        # The return value is stored as the task's terminal result
+        if success:
+            logger.info(f"Document {document_id} processed successfully")
+            return {"status": "success", "document_id": document_id}
+        else:
+            logger.error(f"Document {document_id} processing failed")
+            return {"status": "failure", "document_id": document_id}
         
     except Exception as e:
         logger.error(f"Error processing document {document_id}: {str(e)}")
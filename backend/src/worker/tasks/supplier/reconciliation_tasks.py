@@ -1,14 +1,14 @@
 import logging
-import asyncio
 from uuid import UUID
-from src.worker.celery_app import celery_app
+from src.worker.celery_app import celery_app, run_async
 from src.api.core.logging_config import get_logger
 from src.api.dependencies.db import get_db_session
 from src.api.services.supplier.reconciliation_service import run_reconciliation_process
 
 logger = get_logger("restaurant_api")
 
-@celery_app.task(bind=True)
+# Progress and results reach clients over WebSocket, so nothing reads the task result
+@celery_app.task(bind=True, ignore_result=True)
 def run_reconciliation(self, reconciliation_id: str):
     """
     Run reconciliation process for supplier documents using Azure OpenAI.
@@ -24,13 +24,10 @@ def run_reconciliation(self, reconciliation_id: str):
         
         # Run the reconciliation process
         # Since our service is async and Celery tasks are sync,
-        # we need to run the async function in an event loop
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        success = loop.run_until_complete(
+        # we run it on the worker process's shared event loop
+        success = run_async(
             run_reconciliation_process(db, UUID(reconciliation_id))
         )
-        loop.close()
         
         # The WebSocket updates are handled inside the service
         